@@ -1,5 +1,5 @@
 import pytesseract
-from core.configs import Settings
+from core.configs import get_settings
 
-settings = Settings()
+settings = get_settings()
 pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
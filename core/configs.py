@@ -10,14 +10,17 @@ class Settings(BaseSettings):
     AZURE_MISTRAL_API_KEY: str
     OPENAI_API_VERSION: str
     TESSERACT_CMD: str
+    ENTITY_EXTRACTION_MAX_CONCURRENCY: int = 4
 
     model_config = SettingsConfigDict(
         env_file=".env",
-        case_sensitive=True
+        case_sensitive=True,
+        frozen=True,
+        extra="ignore",
     )
 
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_settings() -> Settings:
     try:
         return Settings()
@@ -1,82 +1,159 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Any, Dict, List, Union
+import weakref
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 from loguru import logger
 from core import settings
 
 from src.models.services import AzureOpenAIModel
 from src.services.llms.azure_openai import AzureOpenAIClient
+from src.services.mistral_document_ai.client import _close_async_http_client
 from src.processor import StructuredJSON2PydanticConverter
 from src.services.llms.azure_openai.params import AzureOpenAIChatCompletionMessageParam
 from src.entity_extractor.base import EntityExtractor
 
+_PLACEHOLDER_STRINGS = frozenset(("0.00", "()-"))
+_STRIP_SPACES = str.maketrans("", "", " ")
+# From this length on, list items are classified with a C-level ``set(map(type, ...))``.
+_BULK_CLASSIFY_MIN_ITEMS = 32
+
+# The converter keeps no per-instance state, so one instance serves every extractor.
+_CONVERTER = StructuredJSON2PydanticConverter()
+
+# Async httpx pools are bound to the event loop that created them, so clients are
+# shared per running loop and dropped together with it.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AzureOpenAIClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_azure_openai_client() -> AzureOpenAIClient:
+    """Return the async Azure OpenAI client shared by calls on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = AzureOpenAIClient(
+            openai_model=AzureOpenAIModel.GPT_4O,
+            openai_api_version=settings.OPENAI_API_VERSION,
+            use_async=True,
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def _close_async_clients() -> None:
+    """Close the running loop's pooled clients, for loops that are discarded after one run."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    try:
+        if client is not None:
+            await client.aclose()
+    finally:
+        await _close_async_http_client()
+
 
 class LandingAIEntityExtractor(EntityExtractor):
     """Entity extractor for LandingAI service."""
 
-    _SYSTEM_PROMPT = (
-        "You are a document intelligence AI assistant in entities extraction. "
-        "Your task is to identify and extract the required entities from the provided text, and structure your response strictly according to the predefined schema.\n"
-        "**Entities extraction instructions:**\n"
-        "- Extract exactly texts present in context (without adding, omitting or modifying) with plausible handled stripped spacing.\n"
-        "- **option <field name> []** represents a checkbox, extract as boolean value: true if checked, false if not checked. Otherwise, consecutive [] represent an empty filled box.\n"
-        "- Ensure number of values, don't omit any values, even if they are empty and maintain the order of elements in lists. "
-        "There are groups of fields representing lists that their length need to be equal, these fields are adjacent in the image. This a group of list: [Security name, Code, No. of share, Redeem All], [From $, to $, %p.a], the number of elements of those sets need to be equal.\n"
-        "\n"
-        "**Entities extraction response format scenarios:**\n"
-        "**- Checkboxes: True/False values:**\n"
-        "   + option `field_name` [] -> False.\n"
-        "   + option `field_name` [x] -> True.\n"
-        "**- Monetary values: Keep dots and commas. Correct stripped values without dollar ($) sign**\n"
-        "   + $ a , b c d . e f -> a,bcd.ef\n"
-        "   + $ [] or [0.00] -> empty (\"\") value\n"
-        "**- Percentage values: Correct stripped values without percentage (%) sign**\n"
-        "   + a b c % -> abc\n"
-        "   + $ [] or [0.00] -> empty (\"\") value\n"
-        "**- Date values: Year can be 2 or 4 digits - Get exactly what they are in context. Correct stripped values**\n"
-        "   + D (D) / M (M) / Y (Y) -> D(D)/M(M)/Y(Y)\n"
-        "   + D D / M M / Y Y Y Y -> DD/MM/YYYY\n"
-        "   + D D - M M - Y Y Y Y -> DD-MM-YYYY\n"
-        "**- List values: Maintain the order of elements in lists as in the context**\n"
-        "   + item1, item2, item3 -> [item1, item2, item3]\n"
-        "   + [a] [,] [b] [c] [d] ... -> Element 'a,bcd' in list\n"
-        "   + [ ] [ ] [ ] ... -> An empty element in the list\n"
-        "   + 0.00 -> An empty element (\"\") in the list\n"
-        "\n"
-        "Your primary goal is to extract accurate entities from the provided text, and produce clean, structured output ready for downstream processing.\n"
+    _SYSTEM_PROMPT = """\
+You are a document intelligence AI assistant in entities extraction. \
+Your task is to identify and extract the required entities from the provided text, and structure your response strictly according to the predefined schema.
+**Entities extraction instructions:**
+- Extract exactly texts present in context (without adding, omitting or modifying) with plausible handled stripped spacing.
+- **option <field name> []** represents a checkbox, extract as boolean value: true if checked, false if not checked. Otherwise, consecutive [] represent an empty filled box.
+- Ensure number of values, don't omit any values, even if they are empty and maintain the order of elements in lists. \
+There are groups of fields representing lists that their length need to be equal, these fields are adjacent in the image. This a group of list: [Security name, Code, No. of share, Redeem All], [From $, to $, %p.a], the number of elements of those sets need to be equal.
+
+**Entities extraction response format scenarios:**
+**- Checkboxes: True/False values:**
+   + option `field_name` [] -> False.
+   + option `field_name` [x] -> True.
+**- Monetary values: Keep dots and commas. Correct stripped values without dollar ($) sign**
+   + $ a , b c d . e f -> a,bcd.ef
+   + $ [] or [0.00] -> empty ("") value
+**- Percentage values: Correct stripped values without percentage (%) sign**
+   + a b c % -> abc
+   + $ [] or [0.00] -> empty ("") value
+**- Date values: Year can be 2 or 4 digits - Get exactly what they are in context. Correct stripped values**
+   + D (D) / M (M) / Y (Y) -> D(D)/M(M)/Y(Y)
+   + D D / M M / Y Y Y Y -> DD/MM/YYYY
+   + D D - M M - Y Y Y Y -> DD-MM-YYYY
+**- List values: Maintain the order of elements in lists as in the context**
+   + item1, item2, item3 -> [item1, item2, item3]
+   + [a] [,] [b] [c] [d] ... -> Element 'a,bcd' in list
+   + [ ] [ ] [ ] ... -> An empty element in the list
+   + 0.00 -> An empty element ("") in the list
+
+Your primary goal is to extract accurate entities from the provided text, and produce clean, structured output ready for downstream processing.
+"""
+
+    # Built once and shared by every request; it is added to the params after
+    # validation, so it is not copied per step.
+    _SYSTEM_MESSAGE: Dict[str, str] = {
+        "role": "system",
+        "content": _SYSTEM_PROMPT
+    }
+    _USER_PROMPT_PREFIX = (
+        "Extract the following entities from the text below and format them according to the schema:\n\n"
+        "Text:\n"
     )
 
     def __init__(self, contexts: Dict[str, List[Dict[str, Any]]]) -> None:
         super().__init__(contexts=contexts)
 
+    @staticmethod
+    def _is_placeholder(value: str) -> bool:
+        """Return True when the value is a placeholder such as ``0.00``, ignoring spaces."""
+        if " " not in value:
+            return value in _PLACEHOLDER_STRINGS
+        return value.translate(_STRIP_SPACES) in _PLACEHOLDER_STRINGS
+
     @staticmethod
     def _post_process_extracted_value(value: Union[str, bool, List[str], List[bool]]) -> Any:
         """
         Post-process the extracted value based on its type.
         """
-        PLACEHOLDER_STRINGS = ["0.00", "()-"]
+        is_placeholder = LandingAIEntityExtractor._is_placeholder
         if isinstance(value, str):
-            if value.replace(" ", "") in PLACEHOLDER_STRINGS:
-                return ""
-            else:
-                return value
+            return "" if is_placeholder(value) else value
         elif isinstance(value, bool):
             return value
         elif isinstance(value, list):
-            processed_list = []
-            for item in value:
-                if isinstance(item, str):
-                    if item.replace(" ", "") in PLACEHOLDER_STRINGS:
-                        processed_list.append("")
-                    else:
-                        processed_list.append(item)
-                elif isinstance(item, bool):
-                    processed_list.append(item)
-            return processed_list
+            return [
+                "" if isinstance(item, str) and is_placeholder(item) else item
+                for item in value
+                if isinstance(item, (str, bool))
+            ]
         else:
             return value
 
+    @staticmethod
+    def _classify_list(value: List[Any]) -> str:
+        """Return the entity type of a list value in a single pass over its items."""
+        if len(value) >= _BULK_CLASSIFY_MIN_ITEMS:
+            item_types = set(map(type, value))
+            if item_types == {str}:
+                return "list[string]"
+            if item_types == {bool}:
+                return "list[boolean]"
+            return "list[mixed]"
+
+        n_str = n_bool = 0
+        for item in value:
+            item_cls = type(item)
+            if item_cls is str:
+                n_str += 1
+            elif item_cls is bool:
+                n_bool += 1
+
+        if n_str == len(value):
+            return "list[string]"
+        if n_bool == len(value):
+            return "list[boolean]"
+        return "list[mixed]"
+
     @staticmethod
     def _structured_entity_extraction(json_entity: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -86,16 +163,16 @@ class LandingAIEntityExtractor(EntityExtractor):
         for key, value in json_entity.items():
             value = LandingAIEntityExtractor._post_process_extracted_value(
                 value)
-            if isinstance(value, (str, bool)):
+            value_cls = type(value)
+            if value_cls is str or value_cls is bool:
                 entity = {
                     "name": key,
                     "values": [{"value": value}],
-                    "type": "string" if isinstance(value, str) else "boolean"
+                    "type": "string" if value_cls is str else "boolean"
                 }
-            elif isinstance(value, list):
+            elif value_cls is list:
                 values = [{"value": item} for item in value]
-                value_type = "list[string]" if all(isinstance(item, str) for item in value) else "list[boolean]" if all(
-                    isinstance(item, bool) for item in value) else "list[mixed]"
+                value_type = LandingAIEntityExtractor._classify_list(value)
                 entity = {
                     "name": key,
                     "values": values,
@@ -107,69 +184,159 @@ class LandingAIEntityExtractor(EntityExtractor):
         return extracted_entities
 
     def extract(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Synchronous wrapper around :meth:`extract_async`.
 
-        response: Dict[str, List[Dict[str, Any]]] = {"steps": []}
+        Must not be called from a running event loop; await ``extract_async`` instead.
+        """
+        return asyncio.run(self._extract_and_close())
 
-        converter = StructuredJSON2PydanticConverter()
-        azure_openai_client = AzureOpenAIClient(
-            openai_model=AzureOpenAIModel.GPT_4O,
-            openai_api_version=settings.OPENAI_API_VERSION,
-            use_async=False,
-        )
+    async def _extract_and_close(self) -> Dict[str, List[Dict[str, Any]]]:
+        # ``asyncio.run`` discards its loop, so the loop's clients cannot be reused.
+        try:
+            return await self.extract_async()
+        finally:
+            await _close_async_clients()
+
+    async def extract_async(self, max_concurrency: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract entities for every step, running the LLM calls concurrently.
+
+        Results keep the order of the steps in the contexts. At most
+        ``max_concurrency`` requests are in flight, defaulting to
+        ``settings.ENTITY_EXTRACTION_MAX_CONCURRENCY``.
+        """
+        indexed_results = [
+            indexed async for indexed in self._aiter_indexed_steps(max_concurrency)]
+        indexed_results.sort(key=lambda indexed: indexed[0])
+        return {"steps": [result for _, result in indexed_results]}
+
+    def iter_steps(self) -> Iterator[Dict[str, Any]]:
+        """Yield each step's result as soon as its LLM call completes.
 
+        Runs on a private event loop, so it must not be called from a running one.
+        """
+        loop = asyncio.new_event_loop()
+        step_results = self.aiter_steps()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(step_results.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(step_results.aclose())
+            loop.run_until_complete(_close_async_clients())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    async def aiter_steps(self, max_concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield each step's result in completion order rather than step order."""
+        async with aclosing(self._aiter_indexed_steps(max_concurrency)) as indexed_results:
+            async for _, result in indexed_results:
+                yield result
+
+    async def _aiter_indexed_steps(
+        self,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
         steps = self.contexts.get("steps", [])
         if not steps:
             logger.warning("No steps found in contexts for entity extraction.")
-            return response
-
-        for i, step in enumerate(steps):
-            step_name = step.get('name', f'step_{i+1}')
-            step_fields = step.get('fields', [])
-            if step_fields:
-                logger.info(f"Extracting entities for step: {step_name}")
-                pydantic_model = converter.convert(step_fields)
-                params = AzureOpenAIChatCompletionMessageParam(
-                    message_text=[
-                        {
-                            "role": "system",
-                            "content": self._SYSTEM_PROMPT
-                        },
-                        {
-                            "role": "user",
-                            "content": (
-                                f"Extract the following entities from the text below and format them according to the schema:\n\n"
-                                f"Text:\n{step.get('context', '')}\n\n"
-                            )
-                        }
-                    ],
-                    response_format=pydantic_model,
-                    temperature=0.25,
-                )
-
-                gpt_response = azure_openai_client.structured_output_generate_response(
-                    params=params)
-                if gpt_response:
-                    json_gpt_response = converter.serialize(
-                        model_class=pydantic_model,
-                        data=gpt_response,
-                        verbose=False
-                    )
-                    logger.debug("LandingAI context:\n{}",
-                                 step.get("context", ""))
-                    logger.debug(
-                        "LandingAI extraction response:\n{}",
-                        json.dumps(json_gpt_response, indent=4),
-                    )
-
-                    response["steps"].append({
-                        "step": step.get("name"),
-                        "fields": self._structured_entity_extraction(json_gpt_response)
-                    })
-                else:
-                    logger.warning(
-                        f"No response from LLM for step: {step_name}")
-                    response["steps"].append({
-                        "step": step.get("name"),
-                        "fields": []
-                    })
-        return response
+            return
+
+        converter = _CONVERTER
+        azure_openai_client = _get_async_azure_openai_client()
+        semaphore = asyncio.Semaphore(
+            max_concurrency or settings.ENTITY_EXTRACTION_MAX_CONCURRENCY)
+
+        async def _bounded_extract_step(i: int, step: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, Any]]]:
+            async with semaphore:
+                return i, await self._extract_step(i, step, converter, azure_openai_client)
+
+        pending = {
+            asyncio.ensure_future(_bounded_extract_step(i, step))
+            for i, step in enumerate(steps)
+        }
+        done: set = set()
+        first_error: Optional[Exception] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        i, result = task.result()
+                    except Exception as error:
+                        # Keep the remaining steps running; the first failure is
+                        # re-raised once every step has finished.
+                        if first_error is None:
+                            first_error = error
+                        continue
+                    if result is not None:
+                        yield i, result
+            if first_error is not None:
+                raise first_error
+        finally:
+            # When the consumer stops early, tasks of the current round may not
+            # have been looked at yet; gathering them retrieves their exceptions.
+            for task in pending:
+                task.cancel()
+            if pending or done:
+                await asyncio.gather(*done, *pending, return_exceptions=True)
+
+    async def _extract_step(
+        self,
+        i: int,
+        step: Dict[str, Any],
+        converter: StructuredJSON2PydanticConverter,
+        azure_openai_client: AzureOpenAIClient,
+    ) -> Optional[Dict[str, Any]]:
+        """Run the LLM extraction for a single step; steps without fields are skipped."""
+        step_name = step.get('name', f'step_{i+1}')
+        step_fields = step.get('fields', [])
+        if not step_fields:
+            return None
+
+        logger.info(f"Extracting entities for step: {step_name}")
+        pydantic_model = converter.convert(step_fields)
+        # The user message and the generated model are validated; the constant
+        # system message is prepended afterwards, as ``model_copy`` does not
+        # validate the update.
+        params = AzureOpenAIChatCompletionMessageParam(
+            message_text=[
+                {
+                    "role": "user",
+                    "content": f"{self._USER_PROMPT_PREFIX}{step.get('context', '')}\n\n"
+                }
+            ],
+            response_format=pydantic_model,
+            temperature=0.25,
+        )
+        params = params.model_copy(
+            update={"message_text": [self._SYSTEM_MESSAGE, *params.message_text]})
+
+        gpt_response = await azure_openai_client.astructured_output_generate_response(
+            params=params)
+        if not gpt_response:
+            logger.warning(
+                f"No response from LLM for step: {step_name}")
+            return {
+                "step": step.get("name"),
+                "fields": []
+            }
+
+        json_gpt_response = converter.serialize(
+            model_class=pydantic_model,
+            data=gpt_response,
+            verbose=False
+        )
+        logger.debug("LandingAI context:\n{}",
+                     step.get("context", ""))
+        logger.debug(
+            "LandingAI extraction response:\n{}",
+            json.dumps(json_gpt_response, indent=4),
+        )
+
+        return {
+            "step": step.get("name"),
+            "fields": self._structured_entity_extraction(json_gpt_response)
+        }
@@ -21,11 +21,10 @@ class EntityExtractorFactory:
             service: ServiceType,
             contexts: Dict[str, List[Dict[str, Any]]]
     ) -> EntityExtractor:
-        try:
-            extractor_cls = cls._EXTRACTOR_MAP[service]
-        except KeyError as error:
+        extractor_cls = cls._EXTRACTOR_MAP.get(service)
+        if extractor_cls is None:
             raise ValueError(
                 f"No entity extractor registered for service '{service.value}'."
-            ) from error
+            )
 
         return extractor_cls(contexts=contexts)
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from base64 import b64encode
 from typing import Optional
 
+try:  # SIMD-accelerated, and encodes straight into a str with no bytes copy.
+    from pybase64 import b64encode_as_string
+except ImportError:  # pragma: no cover - depends on the environment
+    from base64 import b64encode
+
+    def b64encode_as_string(data) -> str:
+        return b64encode(data).decode("ascii")
+
 import fitz  # PyMuPDF
 from loguru import logger
 
@@ -23,12 +30,14 @@ class MistralDocumentAIParser(DocumentParser):
         document: bytes,
         document_parser_mock: Optional[str] = None,
         client: Optional[MistralDocumentAIClient] = None,
+        cache_dir: Optional[str] = None,
     ) -> None:
         super().__init__(document)
         self._client = client or MistralDocumentAIClient()
+        mock_path = document_parser_mock or self._cache_path(cache_dir)
         self._mock_handler: Optional[MistralDocumentAIParserMock] = (
-            MistralDocumentAIParserMock(document_parser_mock)
-            if document_parser_mock
+            MistralDocumentAIParserMock(mock_path)
+            if mock_path
             else None
         )
 
@@ -39,10 +48,12 @@ class MistralDocumentAIParser(DocumentParser):
         return parsed_response
 
     def _parse_document(self) -> None:
-        if self._mock_handler and self._mock_handler.exists():
-            logger.info(
-                f"Mock parsed response loaded from {self._mock_handler.path}.")
-            return self._mock_handler.load()
+        if self._mock_handler:
+            cached_response = self._mock_handler.load_cached()
+            if cached_response is not None:
+                logger.info(
+                    f"Mock parsed response loaded from {self._mock_handler.loaded_path}.")
+                return cached_response
 
         parsed_params = self._build_params()
         parsed_response = self._client.analyze_document(parsed_params)
@@ -70,8 +81,8 @@ class MistralDocumentAIParser(DocumentParser):
                 "MistralDocumentAIParser expects the document input to be bytes-like."
             )
 
-        document_bytes = bytes(self.document)
-        base64_value = b64encode(document_bytes).decode("ascii")
+        # The encoder reads any bytes-like object, so no intermediate copy is made.
+        base64_value = b64encode_as_string(self.document)
 
         document_param = MistralDADocumentParam(base64_data=base64_value)
         return MistralDAChatCompletionMessageParam(document=document_param)
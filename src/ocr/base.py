@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Union
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Union
 
 if TYPE_CHECKING:  # pragma: no cover - only used for type hints
     from landingai_ade.types.parse_response import ParseResponse
@@ -13,6 +17,40 @@ class DocumentParser(ABC):
     def __init__(self, document: Union[bytes, str]) -> None:
         self.document = document
 
+    @cached_property
+    def document_digest(self) -> str:
+        """SHA-256 of the document content, used as a content-addressed cache key."""
+        content = self.document.encode(
+            "utf-8") if isinstance(self.document, str) else self.document
+        return hashlib.sha256(content).hexdigest()
+
+    def _cache_path(self, cache_dir: Optional[str]) -> Optional[str]:
+        """Return the cache file for this document inside ``cache_dir``, if any."""
+        if not cache_dir:
+            return None
+        return os.path.join(cache_dir, f"{self.document_digest}.json")
+
+    @classmethod
+    async def aparse_many(
+        cls,
+        documents: Sequence[bytes],
+        cache_dir: Optional[str] = None,
+        **parser_kwargs: Any,
+    ) -> List[Union[ParseResponse, dict]]:
+        """Parse several documents concurrently, returning responses in input order.
+
+        Each document is parsed in a worker thread so the blocking API calls
+        overlap. Cached responses are replayed and cache misses are persisted
+        exactly as in :meth:`parse`. Pass ``client=`` to share one service client.
+        """
+        parsers = [
+            cls(document, cache_dir=cache_dir, **parser_kwargs)
+            for document in documents
+        ]
+        return list(await asyncio.gather(
+            *(asyncio.to_thread(parser.parse) for parser in parsers)
+        ))
+
     @abstractmethod
     def parse(self, plot: bool = False) -> Union[ParseResponse, dict]:
         """Parse the document and optionally return visualization assets."""
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, Type, Union
+from typing import Dict, Optional, Type, Union
 
 from src.models.services import ServiceType
 
@@ -18,12 +18,21 @@ class DocumentParserFactory:
     }
 
     @classmethod
-    def create_parser(cls, service: ServiceType, document: bytes, document_parser_mock: str = None) -> DocumentParser:
-        try:
-            parser_cls = cls._PARSER_MAP[service]
-        except KeyError as error:
+    def create_parser(
+        cls,
+        service: ServiceType,
+        document: bytes,
+        document_parser_mock: str = None,
+        cache_dir: Optional[str] = None,
+    ) -> DocumentParser:
+        parser_cls = cls._PARSER_MAP.get(service)
+        if parser_cls is None:
             raise ValueError(
                 f"No document parser registered for service '{service.value}'."
-            ) from error
+            )
 
-        return parser_cls(document=document, document_parser_mock=document_parser_mock)
+        return parser_cls(
+            document=document,
+            document_parser_mock=document_parser_mock,
+            cache_dir=cache_dir,
+        )
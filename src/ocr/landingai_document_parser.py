@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import Optional, Union
+from types import MappingProxyType
+from typing import Final, Mapping, Optional, Tuple, Union
 
 import fitz  # PyMuPDF
+import numpy as np
 from landingai_ade.types.parse_response import ParseResponse
 from loguru import logger
 
@@ -10,6 +12,15 @@ from src.services.landing_ai import LandingAIClient
 from src.ocr import DocumentParser
 from src.ocr.mocks.landingai import LandingAIDocumentParserMock
 
+_CHUNK_TYPE_COLORS: Final[Mapping[str, Tuple[float, float, float]]] = MappingProxyType({
+    "text": (0, 0.5, 0),
+    "marginalia": (1, 0, 0),
+    "scan_code": (1, 0.5, 1),
+    "table": (0, 0, 1),
+    "attestation": (1, 0, 0.5),
+    "default": (1, 1, 0),
+})
+
 
 class LandingAIDocumentParser(DocumentParser):
     """Document parser that delegates parsing to LandingAI."""
@@ -19,12 +30,14 @@ class LandingAIDocumentParser(DocumentParser):
         document: bytes,
         document_parser_mock: Optional[str] = None,
         client: Optional[LandingAIClient] = None,
+        cache_dir: Optional[str] = None,
     ) -> None:
         super().__init__(document)
         self._client = client or LandingAIClient()
+        mock_path = document_parser_mock or self._cache_path(cache_dir)
         self._mock_handler: Optional[LandingAIDocumentParserMock] = (
-            LandingAIDocumentParserMock(document_parser_mock)
-            if document_parser_mock
+            LandingAIDocumentParserMock(mock_path)
+            if mock_path
             else None
         )
 
@@ -35,10 +48,12 @@ class LandingAIDocumentParser(DocumentParser):
         return parsed_response
 
     def _parse_document(self) -> ParseResponse:
-        if self._mock_handler and self._mock_handler.exists():
-            logger.info(
-                f"Mock parsed response loaded from {self._mock_handler.path}.")
-            return self._mock_handler.load()
+        if self._mock_handler:
+            cached_response = self._mock_handler.load_cached()
+            if cached_response is not None:
+                logger.info(
+                    f"Mock parsed response loaded from {self._mock_handler.loaded_path}.")
+                return cached_response
 
         parsed_response = self._client.parse(document=self.document)
 
@@ -46,7 +61,7 @@ class LandingAIDocumentParser(DocumentParser):
             try:
                 self._mock_handler.save(parsed_response)
                 logger.info(
-                    f"Mock parsed response saved to {self._mock_handler.path}.")
+                    f"Mock parsed response saved to {self._mock_handler.json_path}.")
             except Exception as error:  # pragma: no cover - defensive logging
                 logger.warning(
                     f"Failed to persist LandingAI mock response: {error}")
@@ -60,42 +75,45 @@ class LandingAIDocumentParser(DocumentParser):
             return
 
         try:
-            doc = fitz.open(stream=self.document, filetype="pdf")
+            doc = fitz.open(stream=memoryview(self.document), filetype="pdf")
         except Exception as error:  # pragma: no cover - defensive logging
             logger.error(f"Failed to open PDF for plotting: {error}")
             return
 
-        chunk_type_colors = {
-            "text": (0, 0.5, 0),
-            "marginalia": (1, 0, 0),
-            "scan_code": (1, 0.5, 1),
-            "table": (0, 0, 1),
-            "attestation": (1, 0, 0.5),
-            "default": (1, 1, 0),
-        }
-
         try:
-            for chunk in parsed_response.chunks:
-                chunk_grounding = chunk.grounding
-                if not chunk_grounding:
-                    continue
-
-                page_num = chunk_grounding.page
-                if page_num < 0 or page_num >= len(doc):
-                    continue
-
-                page = doc[page_num]
-                page_width = page.rect.width
-                page_height = page.rect.height
-
-                chunk_box = chunk_grounding.box
-                x0 = chunk_box.left * page_width
-                y0 = chunk_box.top * page_height
-                x1 = chunk_box.right * page_width
-                y1 = chunk_box.bottom * page_height
-
-                color = chunk_type_colors.get(
-                    chunk.type, chunk_type_colors["default"])
+            page_count = len(doc)
+            chunks = [
+                chunk for chunk in parsed_response.chunks
+                if chunk.grounding and 0 <= chunk.grounding.page < page_count
+            ]
+
+            # Denormalise every bounding box in one vectorised pass.
+            boxes = np.asarray(
+                [
+                    (box.left, box.top, box.right, box.bottom)
+                    for box in (chunk.grounding.box for chunk in chunks)
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 4)
+            page_indices = np.asarray(
+                [chunk.grounding.page for chunk in chunks], dtype=np.intp)
+
+            # Load each referenced page once; its dimensions and its drawing
+            # surface come from the same fitz.Page.
+            page_numbers, page_slots = np.unique(page_indices, return_inverse=True)
+            pages = [doc[page_num] for page_num in page_numbers.tolist()]
+            page_dims = np.asarray(
+                [(page.rect.width, page.rect.height) for page in pages],
+                dtype=np.float64,
+            ).reshape(-1, 2)
+            coords = boxes * np.tile(page_dims[page_slots], (1, 2))
+
+            default_color = _CHUNK_TYPE_COLORS["default"]
+            for chunk, page_slot, (x0, y0, x1, y1) in zip(
+                chunks, page_slots.tolist(), coords.tolist()
+            ):
+                page = pages[page_slot]
+                color = _CHUNK_TYPE_COLORS.get(chunk.type, default_color)
                 rect = fitz.Rect(x0, y0, x1, y1)
                 page.draw_rect(rect, color=color, width=1.0)
 
@@ -1,26 +1,26 @@
 from __future__ import annotations
 
-import json
 from contextlib import contextmanager
 from typing import Any, Dict, Generator
 
+import orjson
 from unittest.mock import patch
 
 from src.ocr.mocks.base import DocumentParserMock
 from src.services.mistral_document_ai.client import MistralDocumentAIClient
+from src.utils import write_atomic
 
 
 class MistralDocumentAIParserMock(DocumentParserMock[Dict[str, Any]]):
     """Persist Mistral Document AI parse responses in JSON form for lightweight replay."""
 
     def load(self) -> Dict[str, Any]:
-        with open(self.path, "r", encoding="utf-8") as mock_file:
-            return json.load(mock_file)
+        with self._map_file(self.path) as mock_data:
+            return orjson.loads(mock_data)
 
     def save(self, payload: Dict[str, Any]) -> None:
         self._prepare_directory()
-        with open(self.path, "w", encoding="utf-8") as mock_file:
-            json.dump(payload, mock_file, ensure_ascii=True, indent=2)
+        write_atomic(self.path, orjson.dumps(payload))
 
     @contextmanager
     def patch_parse(self) -> Generator[None, None, None]:
@@ -33,8 +33,9 @@ class MistralDocumentAIParserMock(DocumentParserMock[Dict[str, Any]]):
             client: MistralDocumentAIClient,
             params,
         ) -> Dict[str, Any]:
-            if mock_handler.exists():
-                return mock_handler.load()
+            cached_response = mock_handler.load_cached()
+            if cached_response is not None:
+                return cached_response
 
             response = original_analyze(client, params)
             mock_handler.save(response)
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import mmap
 import os
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Generic, Iterator, Optional, TypeVar
 
 T = TypeVar("T")
 
 
+@lru_cache(maxsize=None)
+def _ensure_directory(directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+
+
 class DocumentParserMock(ABC, Generic[T]):
     """Base helper for document parser mocks that cache expensive responses.
 
@@ -18,20 +26,51 @@ class DocumentParserMock(ABC, Generic[T]):
             raise ValueError(
                 "mock_path must be provided for DocumentParserMock.")
         self._mock_path = mock_path
+        self._loaded_path: Optional[str] = None
 
     @property
     def path(self) -> str:
         """Absolute or relative path where the mock payload is stored."""
         return self._mock_path
 
+    @property
+    def loaded_path(self) -> str:
+        """Path the last successful ``load`` read from; ``path`` until then."""
+        return self._loaded_path or self._mock_path
+
     def exists(self) -> bool:
         """Return True when a persisted mock payload is available."""
         return os.path.exists(self._mock_path)
 
+    def load_cached(self) -> Optional[T]:
+        """Load the persisted payload, or return None when none is stored.
+
+        Opening the payload doubles as the existence check, so no stat precedes it.
+        """
+        try:
+            return self.load()
+        except FileNotFoundError:
+            return None
+
     def _prepare_directory(self) -> None:
         directory = os.path.dirname(self._mock_path)
         if directory:
-            os.makedirs(directory, exist_ok=True)
+            _ensure_directory(directory)
+
+    @staticmethod
+    @contextmanager
+    def _map_file(path: str) -> Iterator[memoryview]:
+        """Expose a mock file as a read-only memory map, served from the page cache."""
+        with open(path, "rb") as mock_file:
+            if os.fstat(mock_file.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(mock_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
 
     @abstractmethod
     def load(self) -> T:
@@ -1,27 +1,53 @@
 from __future__ import annotations
 
+import os
 import pickle
 from contextlib import contextmanager
 from typing import Generator
 
+import orjson
 from landingai_ade import LandingAIADE
 from landingai_ade.types.parse_response import ParseResponse
 from unittest.mock import patch
 
 from src.ocr.mocks.base import DocumentParserMock
+from src.utils import write_atomic
 
 
 class LandingAIDocumentParserMock(DocumentParserMock[ParseResponse]):
-    """Persist LandingAI parse responses in pickle form for lightweight replay."""
+    """Persist LandingAI parse responses in JSON form for lightweight replay.
+
+    Mocks are written next to ``mock_path`` with a ``.json`` extension. Legacy
+    pickle mocks stored at ``mock_path`` are still loaded, but never written.
+    """
+
+    @property
+    def json_path(self) -> str:
+        """Path of the JSON payload that is preferred over the legacy pickle."""
+        root, extension = os.path.splitext(self.path)
+        return self.path if extension == ".json" else f"{root}.json"
+
+    def exists(self) -> bool:
+        return os.path.exists(self.json_path) or super().exists()
 
     def load(self) -> ParseResponse:
-        with open(self.path, "rb") as mock_file:
-            return pickle.load(mock_file)
+        try:
+            with self._map_file(self.json_path) as mock_data:
+                payload = ParseResponse.model_validate(orjson.loads(mock_data))
+            self._loaded_path = self.json_path
+            return payload
+        except FileNotFoundError:
+            pass
+
+        with self._map_file(self.path) as mock_data:
+            payload = pickle.loads(mock_data)
+        self._loaded_path = self.path
+        return payload
 
     def save(self, payload: ParseResponse) -> None:
         self._prepare_directory()
-        with open(self.path, "wb") as mock_file:
-            pickle.dump(payload, mock_file)
+        write_atomic(self.json_path, orjson.dumps(
+            payload.model_dump(mode="json", by_alias=True)))
 
     @contextmanager
     def patch_parse(self) -> Generator[None, None, None]:
@@ -39,8 +65,9 @@ class LandingAIDocumentParserMock(DocumentParserMock[ParseResponse]):
             *args,
             **kwargs,
         ) -> ParseResponse:
-            if mock_handler.exists():
-                return mock_handler.load()
+            cached_response = mock_handler.load_cached()
+            if cached_response is not None:
+                return cached_response
 
             response = original_parse(client, *args, **kwargs)
             mock_handler.save(response)
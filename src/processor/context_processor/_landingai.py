@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import re
-from difflib import SequenceMatcher
+from itertools import islice
 from typing import Any, Dict, List
 
+import numpy as np
 from landingai_ade.types.parse_response import ParseResponse
+from loguru import logger
+from rapidfuzz import fuzz, process
 
 from src.processor.context_processor.base import ContextProcessor
 
+_STEP_PREFIX_RE = re.compile(r"Step\s+\w+[:.]")
+_SKIPPED_CHUNK_TYPES = frozenset(("scan_code", "marginalia"))
+
 
 class LandingAIContextProcessor(ContextProcessor):
     """Builds contextual step data from LandingAI ParseResponse results."""
@@ -25,20 +31,17 @@ class LandingAIContextProcessor(ContextProcessor):
         chunk_texts: List[str] = []
 
         for chunk in self.parsed_document.chunks:
-            print(f"Chunk type: {chunk.type}")
-            if chunk.type in ["scan_code", "marginalia"]:
+            if chunk.type in _SKIPPED_CHUNK_TYPES:
                 continue
-
-            lines = chunk.markdown.split("\n")
-            remaining_lines = lines[2:] if len(lines) > 2 else []
-
-            cleaned_lines = []
-            for line in remaining_lines:
-                cleaned_line = line.lstrip("#").strip()
-                cleaned_line = cleaned_line.replace("**", "")
-                cleaned_lines.append(cleaned_line)
-
-            chunk_texts.append("\n".join(cleaned_lines))
+            logger.debug("Chunk type: {}", chunk.type)
+
+            # "**" never spans a newline, so bold markers are dropped once per chunk
+            # rather than once per line.
+            remaining_lines = chunk.markdown.split("\n")[2:]
+            chunk_texts.append(
+                "\n".join(line.lstrip("#").strip() for line in remaining_lines)
+                .replace("**", "")
+            )
 
         schema_steps: List[Dict[str, Any]] = self.schema.get("steps", [])
         step_markers: List[Dict[str, Any]] = self._match_schema_steps_to_chunks(
@@ -54,8 +57,8 @@ class LandingAIContextProcessor(ContextProcessor):
                 else len(chunk_texts)
             )
 
-            step_chunks = chunk_texts[start_chunk_index:end_chunk_index]
-            context = "\n".join(step_chunks)
+            context = "\n".join(
+                islice(chunk_texts, start_chunk_index, end_chunk_index))
 
             original_step = schema_steps[schema_step_index]
             processed_steps.append(
@@ -72,28 +75,44 @@ class LandingAIContextProcessor(ContextProcessor):
         self, *, chunk_texts: List[str], schema_steps: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         step_markers: List[Dict[str, Any]] = []
+        # Only chunks opening with a "Step N:" heading can start a step, so their
+        # first lines are collected once instead of once per schema step.
+        step_headings = [
+            (j, first_line)
+            for j, first_line in enumerate(text.partition("\n")[0] for text in chunk_texts)
+            if _STEP_PREFIX_RE.match(first_line)
+        ]
+
+        named_steps = []
         for i, step in enumerate(schema_steps):
             step_name = step.get("step")
-            print(f"Looking for step: {step_name}")
-            if not step_name:
-                continue
-
-            for j, text in enumerate(chunk_texts):
-                if not text:
-                    continue
-                first_line = text.split("\n")[0]
-                if re.match(r"Step\s+[\w\d]+[:.]", first_line):
-                    similarity = SequenceMatcher(
-                        None, first_line, step_name).ratio()
-                    if similarity > 0.85:
-                        step_markers.append(
-                            {
-                                "step_index": i,
-                                "chunk_index": j,
-                                "step_name": step_name,
-                            }
-                        )
-                        break
+            logger.debug("Looking for step: {}", step_name)
+            if step_name:
+                named_steps.append((i, step_name))
+
+        if not named_steps or not step_headings:
+            return step_markers
+
+        # One C++ call scores every step against every heading; float64 keeps
+        # the > 85 comparison identical to fuzz.ratio's own result.
+        matches = process.cdist(
+            [step_name for _, step_name in named_steps],
+            [first_line for _, first_line in step_headings],
+            scorer=fuzz.ratio,
+            dtype=np.float64,
+        ) > 85
+
+        for (i, step_name), row in zip(named_steps, matches):
+            hits = np.flatnonzero(row)
+            if hits.size:
+                # The first matching heading in document order wins.
+                step_markers.append(
+                    {
+                        "step_index": i,
+                        "chunk_index": step_headings[hits[0]][0],
+                        "step_name": step_name,
+                    }
+                )
 
         step_markers.sort(key=lambda marker: marker["chunk_index"])
         return step_markers
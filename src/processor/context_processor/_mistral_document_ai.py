@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Any, Dict, List
 
+from loguru import logger
+
 from src.processor.context_processor.base import ContextProcessor
 
 
+# Debug aid: when set, the combined markdown is written to this path. It is read
+# from the environment so the processor package imports without API settings.
+_MARKDOWN_DUMP_PATH_ENV = "MISTRAL_MARKDOWN_DUMP_PATH"
+
+
 class MistralDAContextProcessor(ContextProcessor):
     """Builds contextual step data from Mistral Document AI ParseResponse results."""
 
@@ -17,25 +25,26 @@ class MistralDAContextProcessor(ContextProcessor):
 
         super().__init__(parsed_document=parsed_document, schema=schema)
 
-    def process(self) -> Dict[str, List[Dict[str, Any]]]:
+    def process(self) -> Dict[str, Any]:
+        """Return the cleaned markdown of every page and the whole document.
+
+        ``pages`` holds one context per page; ``markdown`` joins them into the
+        document-level context.
+        """
         pages = self.parsed_document.get("pages")
         if not pages:
             raise ValueError("Parsed document contains no pages.")
 
-        combined_sections: List[str] = []
         processed_pages: List[Dict[str, Any]] = []
 
         for index, page in enumerate(pages):
             markdown = page.get("markdown")
-            if not isinstance(markdown, str) or not markdown.strip():
+            # Strip once and reuse the result for both the emptiness check and the context.
+            cleaned_markdown = markdown.strip() if isinstance(markdown, str) else ""
+            if not cleaned_markdown:
                 raise ValueError(
                     f"Parsed document page {index} contains no markdown.")
 
-            cleaned_markdown = markdown.strip()
-            if combined_sections and not cleaned_markdown.startswith("---"):
-                combined_sections.append("")  # preserve spacing between pages
-            combined_sections.append(cleaned_markdown)
-
             processed_pages.append(
                 {
                     "page_index": page.get("index", index),
@@ -43,9 +52,20 @@ class MistralDAContextProcessor(ContextProcessor):
                 }
             )
 
-        combined_markdown = "\n".join(combined_sections)
+        combined_markdown = self._combine_markdown(
+            [page["context"] for page in processed_pages])
+
+        dump_path = os.environ.get(_MARKDOWN_DUMP_PATH_ENV)
+        if dump_path:
+            Path(dump_path).write_text(combined_markdown, encoding="utf-8")
+            logger.debug("Combined Mistral markdown written to {}", dump_path)
 
-        with open(Path("combined_mistral_output.md"), "w", encoding="utf-8") as f:
-            f.write(combined_markdown)
+        return {"pages": processed_pages, "markdown": combined_markdown}
 
-        breakpoint()
+    @staticmethod
+    def _combine_markdown(sections: List[str]) -> str:
+        """Join page markdown with a blank line between pages, unless a page opens with a rule."""
+        return sections[0] + "".join(
+            ("\n" if section.startswith("---") else "\n\n") + section
+            for section in sections[1:]
+        )
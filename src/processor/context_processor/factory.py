@@ -24,11 +24,10 @@ class ContextProcessorFactory:
         parsed_document: Any,
         schema: Dict[str, Any],
     ) -> ContextProcessor:
-        try:
-            processor_cls = cls._PROCESSOR_MAP[service]
-        except KeyError as error:
+        processor_cls = cls._PROCESSOR_MAP.get(service)
+        if processor_cls is None:
             raise ValueError(
                 f"No context processor registered for service '{service.value}'."
-            ) from error
+            )
 
         return processor_cls(parsed_document=parsed_document, schema=schema)
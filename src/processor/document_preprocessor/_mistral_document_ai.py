@@ -8,14 +8,10 @@ class MistralDocumentAIPreprocessor(DocumentPreprocessor):
         self,
         document: Union[str, bytes, None] = None,
         settings: Optional[PreprocessingSettings] = None,
+        cache_dir: Optional[str] = None,
     ) -> None:
-        super().__init__(document=document, settings=settings)
+        super().__init__(document=document, settings=settings, cache_dir=cache_dir)
 
     def preprocess(self) -> bytes:
-        document_bytes = self.document_reader(self.document)
-        rotated_document_bytes = self.document_rotator(document_bytes)
-        converted_document_bytes = self.convert_pdf_to_images_to_pdf(
-            rotated_document_bytes)
-        skew_corrected_document_bytes = self.skew_detector(
-            converted_document_bytes)
-        return skew_corrected_document_bytes
+        with self._read_document(self.document) as document_bytes:
+            return self._preprocess_cached(document_bytes)
@@ -1,75 +1,576 @@
+import atexit
+import hashlib
+import math
+import mmap
+import multiprocessing
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional, Tuple, Union
+from functools import lru_cache
+from itertools import groupby
+from multiprocessing import shared_memory
+from typing import BinaryIO, Collection, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+import cv2
 import fitz
+import numpy as np
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as URLLibHTTPError
+from urllib3.util.retry import Retry
 
 from src.processor.page_processor import PageRotator, SkewDetector
+from src.processor.page_processor.skew_detector import SkewDetectionResult
+from src.utils import write_atomic
 
+_JPEG_SAMPLING_FACTORS = {
+    "444": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_444,
+    "422": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_422,
+    "420": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420,
+}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class PreprocessingSettings:
     """Configuration that balances readability with manageable file sizes."""
 
-    raster_dpi: int = 450
+    # 300 DPI is the usual OCR input resolution; higher values grow render cost
+    # and memory quadratically without a measurable accuracy gain.
+    raster_dpi: int = 300
+    # Pixel budget per rasterised page. Larger pages are rendered at a reduced
+    # DPI so that posters and oversize scans do not explode memory and encode
+    # time; the default sits above Letter, A4 and Legal at 300 DPI.
+    max_page_pixels: int = 16_000_000
     jpg_quality: int = 82
+    # Chroma subsampling ("444", "422" or "420"). Document colour carries little
+    # detail, so 4:2:0 halves the chroma data at no visible cost; it is pinned
+    # here rather than left to the OpenCV build's libjpeg defaults.
+    jpeg_subsampling: str = "420"
+    # Two-pass optimised Huffman tables trim a few percent off each page but
+    # roughly double the entropy-coding time.
+    jpeg_optimize: bool = False
     preserve_image_only_pages: bool = True
+    # Pages with selectable text are copied into the output as native PDF
+    # content, keeping their text layer. Enable to rasterise them as well, which
+    # is what every text page went through before the native copy was added.
+    force_rasterize: bool = False
+    # Embed rasterised pages as raw pixmaps that are deflated on save instead of
+    # JPEG-encoding them. Lossless, at the cost of larger output files.
+    lossless_raster: bool = False
+    # Store pages without colour as single-channel grayscale, a third of the
+    # deskew and JPEG work of RGB.
+    detect_grayscale: bool = True
     optimize_garbage: int = 4
     optimize_clean: bool = True
     optimize_deflate: bool = True
+    # MuPDF deflate effort for the final serialisation, 0 (library default) to 100.
+    compression_effort: int = 0
 
     def __post_init__(self) -> None:
         if self.raster_dpi <= 0:
             raise ValueError("raster_dpi must be positive.")
+        if self.max_page_pixels <= 0:
+            raise ValueError("max_page_pixels must be positive.")
         if not (0 <= self.jpg_quality <= 100):
             raise ValueError("jpg_quality must be in the range [0, 100].")
+        if self.jpeg_subsampling not in _JPEG_SAMPLING_FACTORS:
+            raise ValueError(
+                "jpeg_subsampling must be one of "
+                f"{sorted(_JPEG_SAMPLING_FACTORS)}."
+            )
         if not (0 <= self.optimize_garbage <= 4):
             raise ValueError("optimize_garbage must be in the range [0, 4].")
+        if not (0 <= self.compression_effort <= 100):
+            raise ValueError("compression_effort must be in the range [0, 100].")
+
+
+# (page index, encoded image, page width, page height)
+RenderedPage = Tuple[int, bytes, float, float]
+# (shared memory block name, document size) handed to pool workers
+SharedDocument = Tuple[str, int]
+
+_RENDER_WORKERS = os.cpu_count() or 1
+# Documents with fewer pages are processed in-process: starting or feeding the
+# pool costs more than it saves, and small jobs never need the __main__ guard.
+_POOL_MIN_PAGES = 4
+
+# Grayscale detection averages the render down to the probe resolution and
+# accepts channel differences up to the tolerance, which absorbs anti-aliasing
+# and JPEG noise in scans.
+_GRAYSCALE_PROBE_DPI = 24
+_GRAYSCALE_TOLERANCE = 8
+
+_render_executor: Optional[ProcessPoolExecutor] = None
+
+# By the time the pool starts, the deskew pool and HTTP clients may have threads
+# running, and forking a multithreaded process can deadlock in the child. Workers
+# are forked from a clean server process where available, otherwise spawned.
+_RENDER_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _get_render_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool used for page rasterisation."""
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = ProcessPoolExecutor(
+            max_workers=_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context(_RENDER_START_METHOD),
+        )
+        atexit.register(_shutdown_render_executor)
+    return _render_executor
+
+
+def _shutdown_render_executor() -> None:
+    """Stop the shared render pool; it is started again on next use."""
+    global _render_executor
+    if _render_executor is not None:
+        executor, _render_executor = _render_executor, None
+        atexit.unregister(_shutdown_render_executor)
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+_deskew_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_deskew_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool used for skew analysis of rendered pages."""
+    global _deskew_executor
+    if _deskew_executor is None:
+        _deskew_executor = ThreadPoolExecutor(
+            max_workers=_RENDER_WORKERS, thread_name_prefix="deskew")
+    return _deskew_executor
+
+
+def _iter_deskew_results(
+    pages: Iterable[Tuple[int, fitz.Page]],
+    detector: SkewDetector,
+) -> Iterator[Tuple[int, SkewDetectionResult]]:
+    """Yield ``(index, result)`` for each ``(index, page)`` in ``pages``, in order.
+
+    MuPDF is not thread-safe, so pages are rendered on the calling thread and
+    only the OpenCV analysis runs in the pool. At most two rasters per worker
+    are in flight, which bounds memory on long documents.
+    """
+    if _RENDER_WORKERS <= 1:
+        for index, page in pages:
+            yield index, detector.deskew_page(page, encode=False)
+        return
+
+    executor = _get_deskew_executor()
+    pending: Deque[Tuple[int, Future]] = deque()
+    try:
+        for index, page in pages:
+            rendered = detector.render_page(page)
+            pending.append(
+                (index, executor.submit(
+                    detector.deskew_raster, *rendered, encode=False)))
+            del rendered
+            if len(pending) >= 2 * _RENDER_WORKERS:
+                done_index, future = pending.popleft()
+                yield done_index, future.result()
+        while pending:
+            done_index, future = pending.popleft()
+            yield done_index, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+@lru_cache(maxsize=None)
+def _get_http_session() -> requests.Session:
+    """Return the session shared by document downloads, so repeated fetches from
+    the same host reuse pooled connections instead of a fresh TLS handshake."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def _dpi_matrix(dpi: int) -> fitz.Matrix:
+    """Scaling matrix for rendering at ``dpi``; shared because renders never mutate it."""
+    scale = dpi / 72.0
+    return fitz.Matrix(scale, scale)
+
+
+def _page_matrix(page: fitz.Page, settings: PreprocessingSettings) -> fitz.Matrix:
+    """Render matrix for ``page`` at ``raster_dpi``, clamped to ``max_page_pixels``."""
+    matrix = _dpi_matrix(settings.raster_dpi)
+    page_rect = page.rect
+    pixels = page_rect.width * matrix.a * page_rect.height * matrix.d
+    if pixels <= settings.max_page_pixels:
+        return matrix
+
+    scale = matrix.a * math.sqrt(settings.max_page_pixels / pixels)
+    logger.debug(
+        "Rendering page {} at {:.0f} DPI to stay within {} pixels",
+        page.number + 1,
+        scale * 72.0,
+        settings.max_page_pixels,
+    )
+    return fitz.Matrix(scale, scale)
+
+
+def _encode_jpeg(pix: fitz.Pixmap, settings: PreprocessingSettings) -> bytes:
+    """JPEG-encode a pixmap with OpenCV, which is far faster than MuPDF's encoder."""
+    samples = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+        pix.height, pix.width, pix.n)
+    if pix.n == 3:
+        samples = cv2.cvtColor(samples, cv2.COLOR_RGB2BGR)
+    elif pix.n != 1:
+        raise ValueError(f"unsupported pixmap with {pix.n} channels")
+
+    encoded, buffer = cv2.imencode(
+        ".jpg",
+        samples,
+        [
+            cv2.IMWRITE_JPEG_QUALITY, settings.jpg_quality,
+            cv2.IMWRITE_JPEG_OPTIMIZE, int(settings.jpeg_optimize),
+            cv2.IMWRITE_JPEG_SAMPLING_FACTOR,
+            _JPEG_SAMPLING_FACTORS[settings.jpeg_subsampling],
+        ],
+    )
+    if not encoded:
+        raise ValueError("OpenCV failed to encode the page")
+    return buffer.tobytes()
+
+
+def _is_grayscale_pixmap(pix: fitz.Pixmap, dpi: float) -> bool:
+    """Return True when an RGB render, averaged down to the probe resolution, shows no colour."""
+    samples = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+        pix.height, pix.width, pix.n)
+    factor = _GRAYSCALE_PROBE_DPI / dpi
+    if factor < 1.0:
+        samples = cv2.resize(
+            samples,
+            (max(1, round(pix.width * factor)), max(1, round(pix.height * factor))),
+            interpolation=cv2.INTER_AREA,
+        )
+    # max >= min per pixel, so the uint8 difference cannot wrap.
+    spread = samples.max(axis=2) - samples.min(axis=2)
+    return int(spread.max(initial=0)) <= _GRAYSCALE_TOLERANCE
+
+
+def _deskew_pixmap(
+    pix: fitz.Pixmap,
+    detector: SkewDetector,
+    page_number: int,
+) -> Optional[fitz.Pixmap]:
+    """Return a straightened copy of ``pix``, or None when it is not skewed."""
+    samples = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+        pix.height, pix.width, pix.n)
+    if pix.n == 1:
+        samples = samples[:, :, 0]
+        gray = samples
+    else:
+        gray = cv2.cvtColor(samples, cv2.COLOR_RGB2GRAY)
+
+    angle = detector.estimate_image_angle(gray)
+    straightened = detector.straighten_image(samples, angle)
+    if straightened is None:
+        return None
+
+    logger.debug("Deskewed page {} by {:.2f} degrees", page_number + 1, angle)
+    height, width = straightened.shape[:2]
+    # Pixmap only accepts bytes-like samples; the copy is cheap next to the
+    # re-render and PNG round trip that a separate deskew pass would cost.
+    return fitz.Pixmap(
+        pix.colorspace, width, height, straightened.tobytes(), False)
+
+
+def _render_page_to_image(
+    page: fitz.Page,
+    settings: PreprocessingSettings,
+    detector: Optional[SkewDetector] = None,
+) -> Tuple[bytes, float, float]:
+    """Rasterise a page at ``raster_dpi``, within the ``max_page_pixels`` budget.
+
+    Pages without colour are converted to single-channel grayscale. With a
+    ``detector`` the pixmap is deskewed before encoding, and the returned page
+    size grows to the straightened image's bounds. Lossless renders are
+    returned as PNM, which is a header in front of the raw samples, so neither
+    side pays for an image codec.
+    """
+    page_rect = page.rect
+    matrix = _page_matrix(page, settings)
+    pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+    if settings.detect_grayscale and _is_grayscale_pixmap(pix, matrix.a * 72.0):
+        # Deciding from the render itself avoids a second, probe render.
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+    width_pts, height_pts = page_rect.width, page_rect.height
+
+    if detector is not None:
+        straightened = _deskew_pixmap(pix, detector, page.number)
+        if straightened is not None:
+            width_pts *= straightened.width / pix.width
+            height_pts *= straightened.height / pix.height
+            pix = straightened
+
+    if settings.lossless_raster:
+        return pix.tobytes(output="pnm"), width_pts, height_pts
+
+    try:
+        image_bytes = _encode_jpeg(pix, settings)
+    except (ValueError, cv2.error) as exc:
+        logger.warning(
+            "Falling back to PNG for page {} due to JPEG encoding error: {}",
+            page.number + 1,
+            exc,
+        )
+        image_bytes = pix.tobytes(output="png")
+
+    return image_bytes, width_pts, height_pts
+
+
+def _rgb_to_pixmap(image: np.ndarray) -> fitz.Pixmap:
+    """Wrap an RGB raster as a pixmap, skipping a PNG round trip."""
+    height, width = image.shape[:2]
+    return fitz.Pixmap(fitz.csRGB, width, height, image.tobytes(), False)
+
+
+def _iter_document_pages(
+    document: fitz.Document,
+    indices: Sequence[int],
+    settings: PreprocessingSettings,
+    deskew: bool = False,
+) -> Iterator[RenderedPage]:
+    """Render ``indices`` one at a time, so callers can drop each page before the next."""
+    detector = SkewDetector() if deskew else None
+    for index in indices:
+        image_bytes, width, height = _render_page_to_image(
+            document[index], settings, detector)
+        yield index, image_bytes, width, height
+
+
+@contextmanager
+def _mupdf_errors_hidden() -> Iterator[None]:
+    """Stop MuPDF from printing errors to stderr, restoring the previous setting.
+
+    Every MuPDF error surfaces as a Python exception that is logged here, so
+    the duplicate formatted write is dropped (warnings already are). The
+    setting is process-wide, so it is only changed while preprocessing runs.
+    """
+    previous = fitz.TOOLS.mupdf_display_errors()
+    fitz.TOOLS.mupdf_display_errors(False)
+    try:
+        yield
+    finally:
+        fitz.TOOLS.mupdf_display_errors(previous)
+
+
+@contextmanager
+def _share_document(document_bytes: Union[bytes, bytearray, memoryview]) -> Iterator[SharedDocument]:
+    """Copy a serialised PDF once into shared memory for the pool workers.
+
+    Passing the bytes to ``submit`` would pickle a full copy of the document
+    into every task; workers instead map the same block by name.
+    """
+    size = len(document_bytes)
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        block.buf[:size] = document_bytes
+        yield block.name, size
+    finally:
+        block.close()
+        block.unlink()
+
+
+@contextmanager
+def _open_shared_document(shared: SharedDocument) -> Iterator[fitz.Document]:
+    """Open the PDF that ``_share_document`` placed in shared memory, in place."""
+    name, size = shared
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        view = block.buf[:size]
+        try:
+            document = fitz.open(stream=view, filetype="pdf")
+            try:
+                yield document
+            finally:
+                document.close()
+        finally:
+            view.release()
+    finally:
+        block.close()
+
+
+@_mupdf_errors_hidden()
+def _render_pages_worker(
+    shared: SharedDocument,
+    indices: Sequence[int],
+    settings: PreprocessingSettings,
+    deskew: bool = False,
+) -> List[RenderedPage]:
+    """Process pool entry point; fitz documents cannot be shared across processes."""
+    with _open_shared_document(shared) as document:
+        return list(_iter_document_pages(document, indices, settings, deskew))
+
+
+@_mupdf_errors_hidden()
+def _rotate_pages_worker(
+    shared: SharedDocument,
+    indices: Sequence[int],
+) -> List[Tuple[int, int]]:
+    """Process pool entry point returning the net rotation for each page in ``indices``."""
+    with _open_shared_document(shared) as document, PageRotator() as page_rotator:
+        return [(index, page_rotator.rotate(document[index]))
+                for index in indices]
 
 
 class DocumentPreprocessor(ABC):
+    """Base preprocessor that rotates, rasterises and deskews PDFs for OCR.
+
+    By default only pages without selectable text are rasterised; text pages
+    are kept native unless ``PreprocessingSettings.force_rasterize`` is set.
+    Documents of ``_POOL_MIN_PAGES`` pages or more are spread over a shared
+    process pool. Its workers are started with forkserver or spawn, which
+    import the caller's ``__main__`` module, so scripts that preprocess at
+    module level must do so under an ``if __name__ == "__main__":`` guard. The
+    pool is shut down at interpreter exit.
+    """
+
+    _DOWNLOAD_CHUNK_SIZE = 1 << 20
+    _DOWNLOAD_TIMEOUT = (10.0, 60.0)  # (connect, read) seconds
+
     def __init__(
         self,
         document: Union[str, bytes, None] = None,
         settings: Optional[PreprocessingSettings] = None,
+        cache_dir: Optional[str] = None,
     ) -> None:
         self.document = document
         self.settings = settings or PreprocessingSettings()
+        self.cache_dir = cache_dir
 
     def document_reader(self, document: Union[str, bytes]) -> bytes:
+        """Return the document as bytes, reading paths and URLs like ``_read_document``."""
         if isinstance(document, str):
-            try:
-                if document.startswith("http://") or document.startswith("https://"):
-                    response = requests.get(document)
-                    response.raise_for_status()
-                    pdf_bytes = response.content
-                else:
-                    with open(document, "rb") as file:
-                        pdf_bytes = file.read()
-                logger.info(f"PDF size: {len(pdf_bytes) / (1024*1024):.2f} MB")
-            except FileNotFoundError as exc:
-                raise FileNotFoundError(
-                    f"Document not found at path: {document}"
-                ) from exc
-            except IOError as exc:
-                raise IOError(f"Failed to read document: {exc}") from exc
-            return pdf_bytes
+            with self._read_document(document) as view:
+                return bytes(view)
         logger.info(f"PDF size: {len(document) / (1024*1024):.2f} MB")
         return document
 
+    @contextmanager
+    def _read_document(
+        self, document: Union[str, bytes]
+    ) -> Iterator[Union[bytes, bytearray, memoryview]]:
+        """Yield the document's bytes without copying them onto the heap.
+
+        Local paths are mapped directly; downloads are streamed into an
+        anonymous temporary file that is then mapped, so the PDF sits in
+        reclaimable page cache rather than on the Python heap. MuPDF parses the
+        mapped pages in place; the view is only valid inside the ``with`` block.
+        """
+        if not isinstance(document, str):
+            yield self.document_reader(document)
+            return
+
+        if document.startswith(("http://", "https://")):
+            with tempfile.TemporaryFile() as file:
+                try:
+                    self._download_to_file(document, file)
+                except IOError as exc:
+                    raise IOError(f"Failed to read document: {exc}") from exc
+                with self._map_file(file) as view:
+                    yield view
+            return
+
+        try:
+            file = open(document, "rb")
+        except FileNotFoundError as exc:
+            raise FileNotFoundError(
+                f"Document not found at path: {document}"
+            ) from exc
+        except IOError as exc:
+            raise IOError(f"Failed to read document: {exc}") from exc
+
+        with file, self._map_file(file) as view:
+            yield view
+
+    @staticmethod
+    @contextmanager
+    def _map_file(file: BinaryIO) -> Iterator[Union[bytes, memoryview]]:
+        size = os.fstat(file.fileno()).st_size
+        logger.info(f"PDF size: {size / (1024*1024):.2f} MB")
+        if size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+    def _download_to_file(self, url: str, file: BinaryIO) -> None:
+        """Stream a remote PDF into ``file`` without holding it in memory.
+
+        When the server announces the size of an unencoded body, the file is
+        sized once and the body is read straight into its mapping, skipping the
+        intermediate chunk objects; otherwise it is written chunk by chunk.
+        """
+        with _get_http_session().get(
+            url, stream=True, timeout=self._DOWNLOAD_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            content_length = response.headers.get("Content-Length")
+            if (
+                content_length
+                and content_length.isdigit()
+                and int(content_length) > 0
+                and "Content-Encoding" not in response.headers
+            ):
+                size = int(content_length)
+                file.truncate(size)
+                with mmap.mmap(file.fileno(), size) as mapped, memoryview(mapped) as view:
+                    self._read_into(response.raw, view)
+                return
+
+            for chunk in response.iter_content(chunk_size=self._DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
+        file.flush()
+
+    @staticmethod
+    def _read_into(stream, buffer: memoryview) -> None:
+        """Fill ``buffer`` from ``stream``, failing if the body ends early."""
+        size = len(buffer)
+        offset = 0
+        while offset < size:
+            # The slice is released even when the read fails, so the mapping
+            # behind ``buffer`` can still be closed while the error propagates.
+            with buffer[offset:] as remaining:
+                try:
+                    read = stream.readinto(remaining)
+                except URLLibHTTPError as exc:
+                    raise IOError(
+                        f"Connection broken after {offset} of {size} bytes") from exc
+            if not read:
+                raise IOError(
+                    f"Connection closed after {offset} of {size} bytes")
+            offset += read
+
     def document_rotator(self, document_bytes: bytes) -> bytes:
         try:
-            doc = fitz.open(stream=document_bytes, filetype="pdf")
+            doc = fitz.open(stream=memoryview(document_bytes), filetype="pdf")
         except Exception as exc:  # pragma: no cover - passthrough for fitz issues
             logger.error(f"Failed to load document into fitz: {exc}")
             raise
 
         try:
-            page_rotator = PageRotator()
-            for page in doc:
-                page_rotator.rotate(page)
+            self._rotate_document(doc)
 
             rotated_document_bytes = self._serialize_pdf(doc)
             logger.info(
@@ -80,7 +581,11 @@ class DocumentPreprocessor(ABC):
             doc.close()
 
     def convert_pdf_to_images_to_pdf(self, document_bytes: bytes) -> bytes:
-        """Render each PDF page to an image and rebuild a PDF from the rendered pages."""
+        """Render the PDF pages that need it to images and rebuild a PDF from the result.
+
+        When every page can be copied as-is the input bytes are returned untouched,
+        avoiding a needless render/re-encode round trip.
+        """
 
         if not isinstance(document_bytes, (bytes, bytearray)):
             raise TypeError("document_bytes must be bytes-like data.")
@@ -91,26 +596,12 @@ class DocumentPreprocessor(ABC):
             logger.error(f"Failed to load PDF from bytes: {exc}")
             raise
 
-        output_pdf = fitz.open()
+        output_pdf: Optional[fitz.Document] = None
 
         try:
-            page_count = input_pdf.page_count
-
-            for index, page in enumerate(input_pdf):
-                if self._should_copy_page(page):
-                    output_pdf.insert_pdf(
-                        input_pdf, from_page=index, to_page=index)
-                    logger.info(
-                        f"Copied original page {index + 1}/{page_count} (no selectable text)"
-                    )
-                    continue
-
-                image_bytes, page_rect = self._render_page_to_image(page)
-                self._append_rasterized_page(
-                    output_pdf, page_rect, image_bytes)
-                logger.info(
-                    f"Processed page {index + 1}/{page_count} at {self.settings.raster_dpi} DPI"
-                )
+            output_pdf, _ = self._rasterize_document(input_pdf, document_bytes)
+            if output_pdf is input_pdf:
+                return document_bytes
 
             converted_bytes = self._serialize_pdf(output_pdf)
             logger.info(
@@ -122,8 +613,9 @@ class DocumentPreprocessor(ABC):
             logger.error(f"Error during PDF conversion: {exc}")
             raise
         finally:
+            if output_pdf is not None and output_pdf is not input_pdf:
+                output_pdf.close()
             input_pdf.close()
-            output_pdf.close()
 
     def skew_detector(self, document_bytes: bytes) -> bytes:
         if not isinstance(document_bytes, (bytes, bytearray)):
@@ -135,28 +627,10 @@ class DocumentPreprocessor(ABC):
             logger.error(f"Failed to load PDF for skew detection: {exc}")
             raise
 
-        output_pdf = fitz.open()
-        detector = SkewDetector()
+        output_pdf: Optional[fitz.Document] = None
 
         try:
-            page_count = input_pdf.page_count
-            for index in range(page_count):
-                page = input_pdf.load_page(index)
-                result = detector.deskew_page(page)
-
-                if result.image_bytes is None:
-                    output_pdf.insert_pdf(
-                        input_pdf, from_page=index, to_page=index)
-                    continue
-
-                new_page = output_pdf.new_page(
-                    width=result.width_pts, height=result.height_pts
-                )
-                new_page.insert_image(new_page.rect, stream=result.image_bytes)
-                logger.info(
-                    f"Deskewed page {index + 1}/{page_count} by {result.angle:.2f} degrees"
-                )
-
+            output_pdf = self._deskew_document(input_pdf)
             corrected_bytes = self._serialize_pdf(output_pdf)
             logger.info(
                 f"Skew-corrected PDF size: {len(corrected_bytes) / (1024 * 1024):.2f} MB"
@@ -166,46 +640,337 @@ class DocumentPreprocessor(ABC):
             logger.error(f"Error during skew correction: {exc}")
             raise
         finally:
+            if output_pdf is not None and output_pdf is not input_pdf:
+                output_pdf.close()
             input_pdf.close()
+
+    def _preprocess_cached(self, document_bytes: bytes) -> bytes:
+        """Serve ``_preprocess_document`` from ``cache_dir`` when one is configured.
+
+        Preprocessing is deterministic for a given input and settings, so a
+        re-submitted PDF is answered from the cache without touching MuPDF.
+        """
+        cache_path = self._cache_path(document_bytes)
+        if cache_path is None:
+            return self._preprocess_document(document_bytes)
+
+        try:
+            with open(cache_path, "rb") as cached:
+                logger.info("Serving preprocessed PDF from cache")
+                return cached.read()
+        except FileNotFoundError:
+            pass
+
+        preprocessed_bytes = self._preprocess_document(document_bytes)
+        try:
+            self._write_cache(cache_path, preprocessed_bytes)
+        except OSError as exc:
+            logger.warning(f"Failed to cache preprocessed PDF: {exc}")
+        return preprocessed_bytes
+
+    def _cache_path(self, document_bytes: bytes) -> Optional[str]:
+        """Return the cache file for this document and settings, if caching is on."""
+        if not self.cache_dir:
+            return None
+        # BLAKE2b is faster than SHA-256 on CPUs without SHA extensions. The
+        # settings repr is hashed in so results for other settings never collide.
+        digest = hashlib.blake2b(repr(self.settings).encode("utf-8"), digest_size=16)
+        digest.update(document_bytes)
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.pdf")
+
+    @staticmethod
+    def _write_cache(path: str, data: bytes) -> None:
+        """Write ``data`` to ``path`` so concurrent readers never see a partial PDF."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, data)
+
+    @_mupdf_errors_hidden()
+    def _preprocess_document(self, document_bytes: bytes) -> bytes:
+        """Rotate, rasterise and deskew a PDF, serialising it only once at the end.
+
+        The stages hand the live ``fitz.Document`` to each other instead of
+        re-parsing and re-deflating the whole file between steps. Rasterised
+        pages are deskewed on their rendered pixmap, so only copied pages are
+        rendered again by the deskew stage. A document that no stage changes is
+        returned as the original bytes.
+        """
+        # A mapped file already arrives as a view; wrapping it again would leave
+        # a second export of the map alive in tracebacks and block its close.
+        stream = (document_bytes if isinstance(document_bytes, memoryview)
+                  else memoryview(document_bytes))
+        try:
+            document = fitz.open(stream=stream, filetype="pdf")
+        except Exception as exc:  # pragma: no cover - passthrough for fitz issues
+            logger.error(f"Failed to load document into fitz: {exc}")
+            raise
+
+        stages: List[fitz.Document] = [document]
+        try:
+            rotated = self._rotate_document(document, stream)
+
+            rasterized, deskewed_indices = self._rasterize_document(
+                document, deskew=True)
+            if rasterized is not document:
+                stages.append(rasterized)
+
+            deskewed = self._deskew_document(rasterized, skip=deskewed_indices)
+            if deskewed is not rasterized:
+                stages.append(deskewed)
+
+            if not rotated and len(stages) == 1:
+                logger.info("No preprocessing changes; keeping the original PDF")
+                if isinstance(document_bytes, memoryview):
+                    return document_bytes.tobytes()
+                return document_bytes
+
+            preprocessed_bytes = self._serialize_pdf(deskewed)
+            logger.info(
+                f"Preprocessed PDF size: {len(preprocessed_bytes) / (1024 * 1024):.2f} MB"
+            )
+            return preprocessed_bytes
+        finally:
+            for stage in reversed(stages):
+                stage.close()
+
+    @staticmethod
+    def _rotate_document(
+        document: fitz.Document,
+        document_bytes: Optional[bytes] = None,
+    ) -> bool:
+        """Rotate pages in place; return True when any page rotation changed.
+
+        With worker processes and the unrotated ``document_bytes`` available,
+        orientation detection is striped across the shared pool and only the
+        resulting rotations are applied here.
+        """
+        worker_count = min(document.page_count, _RENDER_WORKERS)
+        if (worker_count <= 1 or document_bytes is None
+                or document.page_count < _POOL_MIN_PAGES):
+            rotated = False
+            with PageRotator() as page_rotator:
+                for page in document:
+                    rotated = page_rotator.rotate(page) != 0 or rotated
+            return rotated
+
+        executor = _get_render_executor()
+        indices = range(document.page_count)
+        with _share_document(document_bytes) as shared:
+            futures = [
+                executor.submit(
+                    _rotate_pages_worker, shared, indices[worker::worker_count])
+                for worker in range(worker_count)
+            ]
+            angles = [result for future in futures for result in future.result()]
+
+        rotated = False
+        for index, angle in angles:
+            if angle:
+                page = document[index]
+                page.set_rotation((page.rotation + angle) % 360)
+                rotated = True
+        return rotated
+
+    def _rasterize_document(
+        self,
+        input_pdf: fitz.Document,
+        document_bytes: Optional[bytes] = None,
+        deskew: bool = False,
+    ) -> Tuple[fitz.Document, List[int]]:
+        """Return a document with every page that needs it replaced by an image,
+        along with the indices of the rasterised pages.
+
+        ``input_pdf`` itself is returned when no page needs rasterising. With
+        ``deskew`` each rendered page is straightened before it is encoded. The
+        serialised form of ``input_pdf`` is only produced when worker processes
+        need it and ``document_bytes`` was not supplied.
+        """
+        page_count = input_pdf.page_count
+        copy_flags = [self._should_copy_page(page) for page in input_pdf]
+        if all(copy_flags):
+            logger.info(
+                "No pages require rasterisation; keeping the original PDF")
+            return input_pdf, []
+
+        raster_indices = [index for index, copy_page in enumerate(copy_flags)
+                          if not copy_page]
+        rendered_pages = self._render_pages(
+            input_pdf, document_bytes, raster_indices, deskew)
+
+        # fitz documents are not thread-safe, so assembly stays sequential and
+        # pulls each rendered page only when it is inserted.
+        # Consecutive copied pages go through a single insert_pdf call, which
+        # grafts shared resources once per run rather than once per page.
+        output_pdf = fitz.open()
+        try:
+            index = 0
+            for copy_page, run in groupby(copy_flags):
+                run_length = sum(1 for _ in run)
+                if copy_page:
+                    last = index + run_length - 1
+                    output_pdf.insert_pdf(
+                        input_pdf, from_page=index, to_page=last)
+                    logger.debug(
+                        "Copied original pages {}-{}/{}",
+                        index + 1,
+                        last + 1,
+                        page_count,
+                    )
+                    index = last + 1
+                    continue
+
+                for index in range(index, index + run_length):
+                    _, image_bytes, width, height = next(rendered_pages)
+                    self._append_rasterized_page(
+                        output_pdf, fitz.Rect(0, 0, width, height), image_bytes)
+                    logger.debug(
+                        "Processed page {}/{} at {} DPI",
+                        index + 1,
+                        page_count,
+                        self.settings.raster_dpi,
+                    )
+                index += 1
+        except Exception:
             output_pdf.close()
+            raise
+
+        logger.info(
+            "Rasterised {}/{} pages at {} DPI",
+            len(raster_indices),
+            page_count,
+            self.settings.raster_dpi,
+        )
+        return output_pdf, raster_indices
+
+    @staticmethod
+    def _deskew_document(
+        input_pdf: fitz.Document,
+        skip: Collection[int] = (),
+    ) -> fitz.Document:
+        """Return a document with skewed pages straightened.
+
+        Pages in ``skip`` are copied unchecked. ``input_pdf`` itself is returned
+        when no page needs correcting; otherwise the output is only started at
+        the first skewed page.
+        """
+        skip = frozenset(skip)
+        detector = SkewDetector()
+        output_pdf: Optional[fitz.Document] = None
+        page_count = input_pdf.page_count
+        # First page of the current run of unchanged pages, copied in one
+        # insert_pdf call once the run ends.
+        run_start = 0
+        deskewed = 0
+
+        # Iterating the document walks the page tree once instead of looking
+        # each page up by number.
+        pages = ((index, page) for index, page in enumerate(input_pdf)
+                 if index not in skip)
+
+        try:
+            for index, result in _iter_deskew_results(pages, detector):
+                if result.image is None:
+                    continue
+
+                if output_pdf is None:
+                    output_pdf = fitz.open()
+                if run_start < index:
+                    output_pdf.insert_pdf(
+                        input_pdf, from_page=run_start, to_page=index - 1)
+                run_start = index + 1
+
+                new_page = output_pdf.new_page(
+                    width=result.width_pts, height=result.height_pts
+                )
+                new_page.insert_image(
+                    new_page.rect, pixmap=_rgb_to_pixmap(result.image))
+                deskewed += 1
+                logger.debug(
+                    "Deskewed page {}/{} by {:.2f} degrees",
+                    index + 1,
+                    page_count,
+                    result.angle,
+                )
+
+            if output_pdf is not None and run_start < page_count:
+                output_pdf.insert_pdf(
+                    input_pdf, from_page=run_start, to_page=page_count - 1)
+        except Exception:
+            if output_pdf is not None:
+                output_pdf.close()
+            raise
+
+        if output_pdf is None:
+            return input_pdf
+        logger.info("Deskewed {}/{} pages", deskewed, page_count)
+        return output_pdf
 
     def _should_copy_page(self, page: fitz.Page) -> bool:
-        """Return True when a page contains no selectable text and can be copied directly."""
-        if not self.settings.preserve_image_only_pages:
-            return False
+        """Return True when a page can be copied into the output PDF without rasterising.
 
+        Pages with selectable text are kept as native PDF content unless
+        ``force_rasterize`` is enabled; image-only pages are kept when
+        ``preserve_image_only_pages`` is enabled.
+        """
         try:
-            extracted_text = page.get_text(
-                "text", flags=fitz.TEXTFLAGS_TEXT).strip()
+            # Scanned pages reference no fonts, so a font lookup in the page's
+            # resources separates them from text pages without decoding any
+            # characters.
+            has_text = bool(page.get_fonts(full=False))
         except RuntimeError as exc:
             logger.debug(
-                "Failed to extract text for page %s: %s. Rasterising page.",
+                "Failed to inspect fonts for page {}: {}. Rasterising page.",
                 page.number + 1,
                 exc,
             )
             return False
 
-        return not extracted_text
-
-    def _render_page_to_image(self, page: fitz.Page) -> Tuple[bytes, fitz.Rect]:
-        """Rasterise a page using the fixed DPI budget."""
-        scale = self.settings.raster_dpi / 72.0
-        matrix = fitz.Matrix(scale, scale)
-        pix = page.get_pixmap(matrix=matrix, alpha=False)
-
-        try:
-            image_bytes = pix.tobytes(
-                output="jpeg", jpg_quality=self.settings.jpg_quality)
-        except ValueError as exc:
-            logger.warning(
-                "Falling back to PNG for page %s due to JPEG encoding error: %s",
-                page.number + 1,
-                exc,
-            )
-            image_bytes = pix.tobytes(output="png")
+        if not has_text:
+            return self.settings.preserve_image_only_pages
+        return not self.settings.force_rasterize
 
-        page_rect = fitz.Rect(0, 0, page.rect.width, page.rect.height)
-        return image_bytes, page_rect
+    def _render_pages(
+        self,
+        document: fitz.Document,
+        document_bytes: Optional[bytes],
+        indices: Sequence[int],
+        deskew: bool = False,
+    ) -> Iterator[RenderedPage]:
+        """Rasterise the given pages, yielding them in ``indices`` order.
+
+        Without worker processes each page is rendered only when the caller asks
+        for it, so a single encoded page is held at a time. Pool results are
+        released as they are handed out.
+        """
+        worker_count = min(len(indices), _RENDER_WORKERS)
+
+        if worker_count <= 1 or len(indices) < _POOL_MIN_PAGES:
+            yield from _iter_document_pages(
+                document, indices, self.settings, deskew)
+        else:
+            executor = _get_render_executor()
+            # A live document is written out uncompressed, since the workers
+            # only need to parse it.
+            payload = (document_bytes if document_bytes is not None
+                       else document.tobytes())
+            rendered_pages: Dict[int, RenderedPage] = {}
+            with _share_document(payload) as shared:
+                del payload
+                futures = [
+                    executor.submit(
+                        _render_pages_worker,
+                        shared,
+                        indices[worker::worker_count],
+                        self.settings,
+                        deskew,
+                    )
+                    for worker in range(worker_count)
+                ]
+                for future in futures:
+                    for rendered in future.result():
+                        rendered_pages[rendered[0]] = rendered
+                del futures
+            for index in indices:
+                yield rendered_pages.pop(index)
 
     @staticmethod
     def _append_rasterized_page(
@@ -224,6 +989,9 @@ class DocumentPreprocessor(ABC):
                 garbage=self.settings.optimize_garbage,
                 clean=self.settings.optimize_clean,
                 deflate=self.settings.optimize_deflate,
+                deflate_images=self.settings.optimize_deflate,
+                deflate_fonts=self.settings.optimize_deflate,
+                compression_effort=self.settings.compression_effort,
             )
         except TypeError:
             return document.tobytes()
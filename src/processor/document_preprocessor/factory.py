@@ -1,4 +1,4 @@
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional, Type
 
 from src.models.services import ServiceType
 from src.processor.document_preprocessor.base import DocumentPreprocessor
@@ -18,12 +18,12 @@ class DocumentPreprocessorFactory:
         *,
         service: ServiceType,
         document: Any,
+        cache_dir: Optional[str] = None,
     ) -> DocumentPreprocessor:
-        try:
-            processor_cls = cls._PROCESSOR_MAP[service]
-        except KeyError as error:
+        processor_cls = cls._PROCESSOR_MAP.get(service)
+        if processor_cls is None:
             raise ValueError(
                 f"No document processor registered for service '{service.value}'."
-            ) from error
+            )
 
-        return processor_cls(document=document)
+        return processor_cls(document=document, cache_dir=cache_dir)
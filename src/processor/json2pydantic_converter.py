@@ -1,11 +1,17 @@
 import re
 import json
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from loguru import logger
 
+import orjson
+
 from typing import Dict, Any, List, Type, Tuple, Union, Optional
 from pydantic import BaseModel, Field, create_model, ConfigDict, ValidationError
 
+_INVALID_IDENTIFIER_RE = re.compile(r"\W|^(?=\d)")
+_UNDERSCORE_RUN_RE = re.compile(r"_+")
+
 
 class JSON2PydanticConverter(ABC):
     """
@@ -17,21 +23,25 @@ class JSON2PydanticConverter(ABC):
     _nested_model_counter: int = 0
 
     @staticmethod
+    @lru_cache(maxsize=4096, typed=True)
     def _sanitize_model_name(name: str) -> str:
         """
         Sanitizes a string to be a valid Python identifier for model names.
         - Removes characters invalid for Python identifiers, replaces with '_'.
         - Handles names starting with a digit by prepending 'Model_'.
         - Collapses multiple underscores and strips leading/trailing ones.
+
+        Memoised, since sibling schemas repeat the same field names; ``typed``
+        keeps keys such as ``1`` and ``True`` apart.
         """
         if not isinstance(name, str):
             name = str(name)  # Attempt to convert to string if not already
 
         # Remove characters invalid for Python identifiers, replace with '_'
-        name = re.sub(r"\W|^(?=\d)", "_", name)
+        name = _INVALID_IDENTIFIER_RE.sub("_", name)
 
         # Replace multiple consecutive underscores with a single one
-        name = re.sub(r"_+", "_", name)
+        name = _UNDERSCORE_RUN_RE.sub("_", name)
 
         # Remove leading/trailing underscores
         name = name.strip("_")
@@ -144,6 +154,15 @@ class JSON2PydanticConverter(ABC):
         return data_dict
 
 
+# Base class for all dynamically created models, enforcing strictness and alias usage.
+class _DynamicModelBase(BaseModel):
+    model_config = ConfigDict(
+        extra='forbid',
+        populate_by_name=True,
+        validate_assignment=True
+    )
+
+
 class StructuredJSON2PydanticConverter(JSON2PydanticConverter):
 
     def _convert_dict_to_model(
@@ -169,23 +188,10 @@ class StructuredJSON2PydanticConverter(JSON2PydanticConverter):
             )
 
         field_definitions: Dict[str, Tuple[Any, Any]] = {}
-        # Field counter for generating Pydantic field names like field_1, field_2, ...
-        # This counter is local to each model being defined.
-        pydantic_field_index = 1
-
-        # Base class for all dynamically created models, enforcing strictness and alias usage.
-        class DynamicModelBase(BaseModel):
-            model_config = ConfigDict(
-                extra='forbid',
-                populate_by_name=True,
-                validate_assignment=True
-            )
 
         for original_key, value_schema in schema_dict.items():
-            # pydantic_internal_field_name = f"field_{pydantic_field_index}"
             pydantic_internal_field_name = self._sanitize_model_name(
                 original_key)
-            pydantic_field_index += 1
 
             current_field_type: Any
 
@@ -230,7 +236,7 @@ class StructuredJSON2PydanticConverter(JSON2PydanticConverter):
             CreatedModel: Type[BaseModel] = create_model(
                 model_py_name,
                 **field_definitions,
-                __base__=DynamicModelBase
+                __base__=_DynamicModelBase
             )
             return CreatedModel
         except Exception as e:
@@ -239,10 +245,17 @@ class StructuredJSON2PydanticConverter(JSON2PydanticConverter):
             ) from e
 
     def convert(self, json_input_schema: Dict[str, Any], root_model_name: str = "RootModel") -> Type[BaseModel]:
+        """
+        Returns the Pydantic model for the schema, reusing the class built for an identical schema.
 
+        Keys are not sorted for the cache key because field order is part of the generated model.
+        """
         if not isinstance(json_input_schema, dict):
             raise TypeError("Input JSON schema must be a dictionary.")
 
+        return _convert_cached(orjson.dumps(json_input_schema), root_model_name)
+
+    def _build_root_model(self, json_input_schema: Dict[str, Any], root_model_name: str) -> Type[BaseModel]:
         JSON2PydanticConverter._nested_model_counter = 0
 
         root_model_class = self._convert_dict_to_model(
@@ -250,3 +263,8 @@ class StructuredJSON2PydanticConverter(JSON2PydanticConverter):
             model_py_name=root_model_name,
         )
         return root_model_class
+
+
+@lru_cache(maxsize=256)
+def _convert_cached(schema_json: bytes, root_model_name: str) -> Type[BaseModel]:
+    return StructuredJSON2PydanticConverter()._build_root_model(orjson.loads(schema_json), root_model_name)
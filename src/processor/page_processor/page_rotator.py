@@ -1,17 +1,63 @@
+from typing import Optional
+
 import cv2
 import fitz
 import numpy as np
 import pytesseract
 from loguru import logger
+from PIL import Image
+
+try:  # Optional: keeps one Tesseract handle alive instead of a CLI run per page.
+    from tesserocr import PSM, PyTessBaseAPI
+except ImportError:  # pragma: no cover - depends on the environment
+    PSM = PyTessBaseAPI = None
 
 
 class PageRotator:
-    """Rotate PDF pages while keeping the original content (e.g. widgets) intact."""
+    """Rotate PDF pages while keeping the original content (e.g. widgets) intact.
+
+    When ``tesserocr`` is installed, orientation detection runs on a persistent
+    in-process Tesseract handle (using ``osd.traineddata`` from the tessdata
+    path) rather than spawning the ``tesseract`` binary for every page. Call
+    :meth:`close`, or use the rotator as a context manager, to release it.
+    """
 
     _LANDSCAPE_ROTATION = 90
     _UPSIDE_DOWN_ANGLE = 180
-    _PIXMAP_SCALE = 3.0
-    _MAX_DIMENSION = 4000
+    # OSD only needs legible glyphs: 144 DPI, with the long side capped, is
+    # plenty and keeps the pixels pushed through Tesseract small.
+    _PIXMAP_SCALE = 2.0
+    _MAX_DIMENSION = 1600
+    # min_characters_to_try improves accuracy for sparse documents.
+    _MIN_CHARACTERS_TO_TRY = 200
+
+    def __init__(self) -> None:
+        self._osd_api = self._open_osd_api()
+
+    def __enter__(self) -> "PageRotator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the in-process Tesseract handle, if one was opened."""
+        if self._osd_api is not None:
+            self._osd_api.End()
+            self._osd_api = None
+
+    @classmethod
+    def _open_osd_api(cls) -> Optional["PyTessBaseAPI"]:
+        if PyTessBaseAPI is None:
+            return None
+        try:
+            api = PyTessBaseAPI(psm=PSM.OSD_ONLY)
+        except RuntimeError as exc:
+            logger.warning(
+                "Falling back to the tesseract CLI for orientation detection: {}", exc)
+            return None
+        api.SetVariable("min_characters_to_try", str(cls._MIN_CHARACTERS_TO_TRY))
+        return api
 
     def rotate(self, page: fitz.Page) -> int:
         """Rotate the supplied page in-place and return the net rotation applied.
@@ -43,8 +89,13 @@ class PageRotator:
         return angle
 
     def _correct_upside_down(self, page: fitz.Page) -> int:
-        pix = page.get_pixmap(matrix=fitz.Matrix(
-            self._PIXMAP_SCALE, self._PIXMAP_SCALE))
+        # Render straight at OSD size, in gray, so the image needs no further
+        # downscaling or conversion before Tesseract.
+        rect = page.rect
+        scale = min(self._PIXMAP_SCALE,
+                    self._MAX_DIMENSION / max(rect.width, rect.height, 1.0))
+        pix = page.get_pixmap(
+            matrix=fitz.Matrix(scale, scale), colorspace=fitz.csGRAY, alpha=False)
         image = self._pix_to_cv2_image(pix)
 
         text_orientation = self._get_text_orientation(image, page.number)
@@ -59,19 +110,13 @@ class PageRotator:
 
     def _get_text_orientation(self, image: np.ndarray, page_num: int) -> int:
         """Return the detected text orientation in degrees."""
-        image_for_osd = self._downscale_for_osd(image)
-
         try:
-            if image_for_osd.ndim == 2:
-                gray = image_for_osd
+            if image.ndim == 2:
+                gray = image
             else:
-                gray = cv2.cvtColor(image_for_osd, cv2.COLOR_BGR2GRAY)
+                gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
 
-            # min_characters_to_try improves accuracy for sparse documents.
-            result = pytesseract.image_to_osd(
-                gray, output_type="dict", config="--psm 0 -c min_characters_to_try=200"
-            )
-            orientation = result.get("orientation", 0)
+            orientation = self._detect_orientation(gray)
         except Exception as exc:  # noqa: BLE001
             logger.warning(
                 "Failed to detect text orientation on page {}: {}", page_num + 1, exc
@@ -82,32 +127,44 @@ class PageRotator:
                      page_num + 1, orientation)
         return orientation
 
-    def _downscale_for_osd(self, image: np.ndarray) -> np.ndarray:
-        height, width = image.shape[:2]
-        max_dim = max(height, width)
-        if max_dim <= self._MAX_DIMENSION:
-            return image
+    def _detect_orientation(self, gray: np.ndarray) -> int:
+        if self._osd_api is not None:
+            self._osd_api.SetImage(Image.fromarray(gray))
+            result = self._osd_api.DetectOrientationScript()
+            return result["orient_deg"] if result else 0
 
-        scale = self._MAX_DIMENSION / max_dim
-        new_size = (int(width * scale), int(height * scale))
-        return cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+        result = pytesseract.image_to_osd(
+            gray,
+            output_type="dict",
+            config=f"--psm 0 -c min_characters_to_try={self._MIN_CHARACTERS_TO_TRY}",
+        )
+        return result.get("orientation", 0)
 
     def _pix_to_cv2_image(self, pix: fitz.Pixmap) -> np.ndarray:
+        """Return an RGB image, or a single-channel one for gray pixmaps.
+
+        The samples are viewed in place rather than copied, so the result is
+        only valid while ``pix`` is alive; only alpha removal allocates. Callers
+        reduce to gray, so the channel order never needs swapping to BGR.
+        """
         # If the image is CMYK convert it to RGB before handing to OpenCV.
         if pix.n - pix.alpha == 4:
             pix = fitz.Pixmap(fitz.csRGB, pix)
+            # The converted pixmap dies with this frame, so its samples are
+            # copied out instead of viewed.
+            samples = pix.samples
+        else:
+            samples = pix.samples_mv
+
+        img = np.frombuffer(samples, dtype=np.uint8).reshape(
+            pix.h, pix.w, pix.n)
 
         if pix.n - pix.alpha == 1:
-            img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
-                pix.h, pix.w).copy()
-            return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+            # Orientation detection works on gray input, so no colour expansion.
+            return img[:, :, 0]
 
-        img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
-            pix.h, pix.w, pix.n).copy()
         if pix.alpha:
-            img = img[:, :, :3]
-
-        if pix.colorspace == fitz.csRGB:
-            return cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+            # Drops alpha in one pass and leaves a contiguous image.
+            return cv2.cvtColor(img, cv2.COLOR_RGBA2RGB)
 
         return img
@@ -1,12 +1,15 @@
 import math
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
 
 import cv2
 import fitz
 import numpy as np
 from loguru import logger
 
+_EMPTY_ANGLES = np.empty(0, dtype=np.float32)
+_ERODE_KERNEL = np.ones((3, 3), dtype=np.uint8)
+
 
 @dataclass(frozen=True)
 class SkewDetectionResult:
@@ -14,6 +17,8 @@ class SkewDetectionResult:
     image_bytes: Optional[bytes]
     width_pts: float
     height_pts: float
+    # Straightened RGB raster, set instead of image_bytes when encode=False.
+    image: Optional[np.ndarray] = None
 
 
 class SkewDetector:
@@ -52,51 +57,124 @@ class SkewDetector:
         analysis_image, _ = self._page_to_numpy(page, retain_scale=False)
         return self._estimate_angle(analysis_image)
 
-    def deskew_page(self, page: fitz.Page) -> SkewDetectionResult:
-        """Return skew correction artefacts for a page. If no correction needed, image_bytes is None."""
-        raster, (scale_x, scale_y) = self._page_to_numpy(
-            page, retain_scale=True)
-        angle = self._estimate_angle(raster)
+    def deskew_page(self, page: fitz.Page, encode: bool = True) -> SkewDetectionResult:
+        """Return skew correction artefacts for a page. If no correction needed, image_bytes is None.
+
+        With ``encode=False`` the straightened raster is returned as ``image``
+        instead of PNG bytes, for in-process consumers that would only decode it.
+        """
+        return self.deskew_raster(*self.render_page(page), encode=encode)
+
+    def render_page(
+        self, page: fitz.Page
+    ) -> Tuple[np.ndarray, Tuple[float, float], Tuple[float, float]]:
+        """Render ``page`` for :meth:`deskew_raster`.
+
+        Returns the RGB raster, its points-per-pixel scale and the page size in
+        points. This is the only MuPDF work in deskewing, so callers that fan
+        pages out to threads keep it on the thread that owns the document.
+        """
+        raster, scale = self._page_to_numpy(page, retain_scale=True)
+        return raster, scale, (page.rect.width, page.rect.height)
+
+    def deskew_raster(
+        self,
+        raster: np.ndarray,
+        scale: Tuple[float, float],
+        page_size: Tuple[float, float],
+        encode: bool = True,
+    ) -> SkewDetectionResult:
+        """Straighten a raster from :meth:`render_page`; see :meth:`deskew_page`.
+
+        Only OpenCV and NumPy run here, both of which release the GIL, so this
+        half is safe to call from worker threads.
+        """
+        scale_x, scale_y = scale
+        width_pts, height_pts = page_size
+        unchanged = SkewDetectionResult(
+            angle=0.0, image_bytes=None, width_pts=width_pts, height_pts=height_pts)
 
+        angle = self.estimate_image_angle(raster)
         if abs(angle) < self.min_correction:
-            return SkewDetectionResult(angle=0.0, image_bytes=None, width_pts=page.rect.width, height_pts=page.rect.height)
+            return unchanged
 
         rotated = self._rotate_image(raster, angle)
         width_pts = rotated.shape[1] * scale_x
         height_pts = rotated.shape[0] * scale_y
 
-        encode_params = [int(cv2.IMWRITE_PNG_COMPRESSION), 9]
+        if not encode:
+            return SkewDetectionResult(
+                angle=angle,
+                image_bytes=None,
+                width_pts=width_pts,
+                height_pts=height_pts,
+                image=rotated,
+            )
+
+        encode_params = [int(cv2.IMWRITE_PNG_COMPRESSION), 1]
         try:
-            success, buffer = cv2.imencode(".png", rotated, encode_params)
+            # OpenCV encoders expect BGR; this is the only place it is needed.
+            success, buffer = cv2.imencode(
+                ".png", cv2.cvtColor(rotated, cv2.COLOR_RGB2BGR), encode_params)
         except cv2.error as exc:  # pragma: no cover - guard against OpenCV backend issues
             logger.warning(f"Failed to encode rotated page as PNG: {exc}")
-            return SkewDetectionResult(angle=0.0, image_bytes=None, width_pts=page.rect.width, height_pts=page.rect.height)
+            return unchanged
 
         if not success:
             logger.warning(
                 "OpenCV failed to encode rotated image; falling back to uncorrected page.")
-            return SkewDetectionResult(angle=0.0, image_bytes=None, width_pts=page.rect.width, height_pts=page.rect.height)
+            return unchanged
 
-        return SkewDetectionResult(angle=angle, image_bytes=buffer.tobytes(), width_pts=width_pts, height_pts=height_pts)
+        return SkewDetectionResult(
+            angle=angle,
+            image_bytes=buffer.tobytes(),
+            width_pts=width_pts,
+            height_pts=height_pts,
+        )
+
+    def estimate_image_angle(self, image: np.ndarray) -> float:
+        """Return the estimated skew angle (degrees) for an RGB or grayscale raster.
+
+        The angle does not depend on resolution, so it is estimated on the
+        downscaled image; only the rotation needs the full raster.
+        """
+        return self._estimate_angle(self._downscale_for_analysis(image))
+
+    def straighten_image(self, image: np.ndarray, angle: float) -> Optional[np.ndarray]:
+        """Rotate ``image`` by ``angle``; None when the angle is below ``min_correction``."""
+        if abs(angle) < self.min_correction:
+            return None
+        return self._rotate_image(image, angle)
 
     def _page_to_numpy(self, page: fitz.Page, retain_scale: bool) -> Tuple[np.ndarray, Tuple[float, float]]:
+        if not retain_scale:
+            # Detection alone only needs luminance, so render straight to a
+            # single channel rather than rendering colour and reducing it.
+            pix = page.get_pixmap(
+                matrix=self._render_matrix, colorspace=fitz.csGRAY, alpha=False)
+            gray = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+                pix.height, pix.width)
+            analysis_image = self._downscale_for_analysis(gray)
+            if analysis_image is gray:
+                analysis_image = gray.copy()
+            return analysis_image, (1.0, 1.0)
+
         pix = page.get_pixmap(matrix=self._render_matrix, alpha=False)
-        image = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+        # The raster stays in MuPDF's RGB order; every analysis step is channel
+        # order agnostic once reduced to gray. Each branch writes its own copy,
+        # so the samples view never outlives ``pix``.
+        image = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
             pix.height, pix.width, pix.n)
 
-        if pix.n == 4:
-            image = cv2.cvtColor(image, cv2.COLOR_RGBA2BGR)
-        elif pix.n == 3:
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        if pix.n == 3:
+            image = image.copy()
+        elif pix.n == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_RGBA2RGB)
         elif pix.n == 1:
-            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
         else:  # pragma: no cover - unexpected pixmap format
             raise ValueError(f"Unsupported pixmap channels: {pix.n}")
 
-        if not retain_scale:
-            analysis_image = self._downscale_for_analysis(image)
-            return analysis_image, (1.0, 1.0)
-
         scale_x = page.rect.width / float(pix.width)
         scale_y = page.rect.height / float(pix.height)
         return image, (scale_x, scale_y)
@@ -110,34 +188,44 @@ class SkewDetector:
 
         scale = self._analysis_scale_limit / float(max_dim)
         new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
-        return cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+        # INTER_AREA only pays off once each output pixel covers several input
+        # pixels; for mild reductions bilinear is equivalent and much faster.
+        interpolation = cv2.INTER_AREA if scale <= 0.5 else cv2.INTER_LINEAR
+        return cv2.resize(image, new_size, interpolation=interpolation)
 
     def _estimate_angle(self, image: np.ndarray) -> float:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (5, 5), 0)
+        # A single scratch image carries the pipeline: it is allocated by the
+        # blur (or the gray conversion, which owns its output) and every later
+        # step up to the edge map writes back into it. A caller's gray input is
+        # never modified.
+        if image.ndim == 2:
+            morph = cv2.GaussianBlur(image, (5, 5), 0)
+        else:
+            morph = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            cv2.GaussianBlur(morph, (5, 5), 0, dst=morph)
 
-        _, binary = cv2.threshold(
-            gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        binary = cv2.bitwise_not(binary)
+        # Inverted Otsu in one pass, rather than thresholding then bitwise_not.
+        cv2.threshold(
+            morph, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU, dst=morph)
 
         kernel_width = max(3, int(round(image.shape[1] * 0.015)))
         if kernel_width % 2 == 0:
             kernel_width += 1
         kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_width, 3))
-        morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
-        morph = cv2.erode(morph, np.ones((3, 3), dtype=np.uint8), iterations=1)
+        cv2.morphologyEx(morph, cv2.MORPH_CLOSE, kernel, dst=morph, iterations=1)
+        cv2.erode(morph, _ERODE_KERNEL, dst=morph, iterations=1)
 
         edges = cv2.Canny(morph, 50, 150, apertureSize=3, L2gradient=True)
 
-        weighted_angles = self._collect_hough_segment_angles(edges)
-        if weighted_angles:
-            angle = self._robust_weighted_angle(weighted_angles)
+        angles, weights = self._collect_hough_segment_angles(edges)
+        if angles.size:
+            angle = self._robust_weighted_angle(angles, weights)
             if abs(angle) <= self.max_skew:
                 return angle
 
-        weighted_angles = self._collect_standard_hough_angles(edges)
-        if weighted_angles:
-            angle = self._robust_weighted_angle(weighted_angles)
+        angles, weights = self._collect_standard_hough_angles(edges)
+        if angles.size:
+            angle = self._robust_weighted_angle(angles, weights)
             if abs(angle) <= self.max_skew:
                 return angle
 
@@ -151,7 +239,8 @@ class SkewDetector:
 
         return self._angle_from_min_area(coords)
 
-    def _collect_hough_segment_angles(self, edges: np.ndarray) -> List[Tuple[float, float]]:
+    def _collect_hough_segment_angles(self, edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(angles, lengths)`` of the probabilistic Hough segments."""
         height, width = edges.shape[:2]
         threshold = max(60, int(0.12 * min(height, width)))
         min_line_length = max(width // 4, 40)
@@ -167,44 +256,38 @@ class SkewDetector:
         )
 
         if lines is None:
-            return []
-
-        weighted_angles: List[Tuple[float, float]] = []
-        for x1, y1, x2, y2 in lines[:, 0]:
-            dx = x2 - x1
-            dy = y2 - y1
-            if dx == 0 and dy == 0:
-                continue
-            angle = math.degrees(math.atan2(dy, dx))
-            angle = self._normalise_angle(angle)
-            length = math.hypot(dx, dy)
-            if abs(angle) <= 90.0 and length >= 5:
-                weighted_angles.append((angle, length))
-        return weighted_angles
-
-    def _collect_standard_hough_angles(self, edges: np.ndarray) -> List[Tuple[float, float]]:
+            return _EMPTY_ANGLES, _EMPTY_ANGLES
+
+        segments = lines[:, 0].astype(np.float64)
+        dx = segments[:, 2] - segments[:, 0]
+        dy = segments[:, 3] - segments[:, 1]
+        angles = self._normalise_angles(np.degrees(np.arctan2(dy, dx)))
+        lengths = np.hypot(dx, dy)
+        # Zero-length segments fall under the length cut as well.
+        keep = lengths >= 5
+        return angles[keep], lengths[keep]
+
+    def _collect_standard_hough_angles(self, edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(angles, weights)`` of the standard Hough lines, weighted by ``|rho|``."""
         height, width = edges.shape[:2]
         accumulator_threshold = max(80, int(0.08 * max(height, width)))
-        lines = cv2.HoughLines(edges, 1, np.pi / 1800.0, accumulator_threshold)
+        lines = cv2.HoughLines(edges, 1, np.pi / 900.0, accumulator_threshold)
 
         if lines is None:
-            return []
-
-        weighted_angles: List[Tuple[float, float]] = []
-        for rho, theta in lines[:, 0]:
-            angle = (theta - np.pi / 2.0) * 180.0 / np.pi
-            angle = self._normalise_angle(angle)
-            weight = max(1.0, abs(rho))
-            if abs(angle) <= 90.0:
-                weighted_angles.append((angle, weight))
-        return weighted_angles
-
-    def _robust_weighted_angle(self, weighted_angles: List[Tuple[float, float]]) -> float:
-        if not weighted_angles:
+            return _EMPTY_ANGLES, _EMPTY_ANGLES
+
+        rhos = lines[:, 0, 0]
+        thetas = lines[:, 0, 1]
+        angles = self._normalise_angles((thetas - np.pi / 2.0) * 180.0 / np.pi)
+        weights = np.maximum(np.abs(rhos), 1.0)
+        return angles, weights
+
+    def _robust_weighted_angle(self, angles: np.ndarray, weights: np.ndarray) -> float:
+        if not angles.size:
             return 0.0
 
-        angles = np.array([a for a, _ in weighted_angles], dtype=np.float32)
-        weights = np.array([w for _, w in weighted_angles], dtype=np.float32)
+        angles = angles.astype(np.float32, copy=False)
+        weights = weights.astype(np.float32, copy=False)
 
         sorter = np.argsort(angles)
         angles = angles[sorter]
@@ -247,6 +330,12 @@ class SkewDetector:
             angle -= 180.0
         return angle
 
+    @staticmethod
+    def _normalise_angles(angles: np.ndarray) -> np.ndarray:
+        """Vectorised :meth:`_normalise_angle` for inputs within (-270, 270]."""
+        angles = np.where(angles <= -90.0, angles + 180.0, angles)
+        return np.where(angles > 90.0, angles - 180.0, angles)
+
     def _rotate_image(self, image: np.ndarray, angle: float) -> np.ndarray:
         if abs(angle) < self.min_correction:
             return image
@@ -1,31 +1,38 @@
 import json
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from tabulate import tabulate
 from difflib import SequenceMatcher
-from sklearn.metrics import confusion_matrix
 
 
-def sequence_matcher_similarity(element1, element2):
+def sequence_matcher_similarity(element1, element2, matcher: Optional[SequenceMatcher] = None):
     if type(element1) != type(element2):
         return 0
     if isinstance(element1, bool):
         return int(element1 == element2)
-    return SequenceMatcher(None, element1, element2).ratio()
+    if isinstance(element1, str) and element1 == element2:
+        return 1.0
+    if matcher is None:
+        return SequenceMatcher(None, element1, element2).ratio()
+    # set_seqs keeps the b2j index when the second sequence is unchanged.
+    matcher.set_seqs(element1, element2)
+    return matcher.ratio()
 
 
 def sequence_matcher_lst_similarity(lst1: list, lst2: list):
     score_lst = []
     len1, len2 = len(lst1), len(lst2)
+    matcher = SequenceMatcher(None)
 
     if len1 == len2:
         score_lst = [sequence_matcher_similarity(
-            e1, e2) for e1, e2 in zip(lst1, lst2)]
+            e1, e2, matcher) for e1, e2 in zip(lst1, lst2)]
         return sum(score_lst) / len1
 
     num_min_elements = min(len1, len2)
     score_lst = [
-        2 * sequence_matcher_similarity(lst1[i], lst2[i]) for i in range(num_min_elements)]
+        2 * sequence_matcher_similarity(lst1[i], lst2[i], matcher) for i in range(num_min_elements)]
 
     return sum(score_lst) / (2 * num_min_elements + abs(len1 - len2))
 
@@ -38,31 +45,63 @@ class EntityExtractionValidator:
     ):
         self.validation_file = validation_file
         self.schema_file = schema_file
+        self._schema: Optional[Dict[str, Any]] = None
+        self._gt_fields_by_step: Optional[Dict[str, Any]] = None
 
-    def validate_document(self, pred: Dict[str, Any], multimodal_eval: bool = False, verbose: bool = False) -> None:
-
-        track_result = {}
+    def _load_files(self) -> None:
+        """Read the schema and ground truth on the first validate_document call.
 
-        flag = True  # Flag to indicate if validation is successful
+        Both files are fixed for the validator's lifetime, so later calls reuse
+        them. Loading errors are still raised from validate_document.
+        """
+        if self._schema is not None:
+            return
         try:
             with open(self.schema_file, 'r') as file:
                 schema = json.load(file)
             with open(self.validation_file, 'r') as file:
                 gt = json.load(file)
 
-            if not all(key in schema for key in ['steps']) or not all(key in gt for key in ['steps']) or 'steps' not in pred:
+            if 'steps' not in schema or 'steps' not in gt:
                 raise ValueError("Missing `steps` key in one of the files.")
         except Exception as e:
             raise ValueError(f"Error loading schema or validation file: {e}")
 
+        self._gt_fields_by_step = self._index_steps(gt['steps'])
+        self._schema = schema
+
+    @staticmethod
+    def _index_steps(steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Map step name to its fields, keeping the first step of each name."""
+        fields_by_step = {}
+        for step in steps:
+            fields_by_step.setdefault(step['step'], step['fields'])
+        return fields_by_step
+
+    @staticmethod
+    def _index_fields(fields: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Map lower-cased field name to its field, keeping the first of each name."""
+        fields_by_name = {}
+        for field in fields:
+            fields_by_name.setdefault(field['name'].lower(), field)
+        return fields_by_name
+
+    def validate_document(self, pred: Dict[str, Any], multimodal_eval: bool = False, verbose: bool = False) -> None:
+
+        track_result = {}
+
+        flag = True  # Flag to indicate if validation is successful
+        self._load_files()
+        if 'steps' not in pred:
+            raise ValueError("Missing `steps` key in the prediction.")
+        pred_fields_by_step = self._index_steps(pred['steps'])
+
         # Compare each step
-        for index, _step in enumerate(schema['steps']):
+        for index, _step in enumerate(self._schema['steps']):
             step_name = _step['step']
             try:
-                fields_gt_lst = next(
-                    (step['fields'] for step in gt['steps'] if step['step'] == step_name), None)
-                fields_pred_lst = next(
-                    (step['fields'] for step in pred['steps'] if step['step'] == step_name), None)
+                fields_gt_lst = self._gt_fields_by_step.get(step_name)
+                fields_pred_lst = pred_fields_by_step.get(step_name)
                 if fields_pred_lst is None:
                     print(f"No matching step found for step name: {step_name}")
                     flag = False
@@ -71,13 +110,13 @@ class EntityExtractionValidator:
                 print(f"Error: {e}")
                 flag = False
                 break
+            fields_pred_by_name = self._index_fields(fields_pred_lst)
 
             for field_gt in fields_gt_lst:
                 field_name_gt = field_gt.get('name')
                 field_value_gt = field_gt.get('value')
                 field_type_gt = field_gt.get('type')
-                field_pred = next((field for field in fields_pred_lst if field['name'].lower(
-                ) == field_name_gt.lower()), None)
+                field_pred = fields_pred_by_name.get(field_name_gt.lower())
 
                 # Skip if field not found in prediction
                 if field_pred is None:
@@ -175,9 +214,14 @@ class EntityExtractionValidator:
         Returns the F1 score for boolean values. If groundtruth does not contain positive value, specificity  is returned instead.
         '''
 
-        # Calculate confusion matrix
-        tn, fp, fn, tp = confusion_matrix(
-            gt, pred, labels=[False, True]).ravel()
+        # Confusion matrix counts; kept as NumPy integers so degenerate ratios
+        # still come out as nan rather than raising.
+        gt_mask = np.asarray(gt, dtype=bool)
+        pred_mask = np.asarray(pred, dtype=bool)
+        tp = np.sum(gt_mask & pred_mask)
+        tn = np.sum(~gt_mask & ~pred_mask)
+        fp = np.sum(~gt_mask & pred_mask)
+        fn = np.sum(gt_mask & ~pred_mask)
         if tp == 0:
             return tn / (tn + fp)
         precision = tp / (tp + fp)
@@ -185,8 +229,7 @@ class EntityExtractionValidator:
         return 2 * (precision * recall) / (precision + recall)
 
     def _validate_verbose(self, track_result: Dict[str, Any]) -> None:
-        df = pd.DataFrame(columns=[
-                          'Field Type', 'Total Field', 'Correct Field', 'Accuracy', 'Lowercase Accuracy'])
+        rows = []
         for key, value in track_result.items():
             if value.get('similar_score'):
                 accuracy = sum(value['similar_score']) / \
@@ -223,7 +266,9 @@ class EntityExtractionValidator:
                 'Accuracy': accuracy,
                 'Lowercase Accuracy': accuracy_lowercase,
             }
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+            rows.append(new_row)
             print(f"Accuracy for `{key}` is {accuracy}")
 
+        df = pd.DataFrame(rows, columns=[
+                          'Field Type', 'Total Field', 'Correct Field', 'Accuracy', 'Lowercase Accuracy'])
         print(tabulate(df, headers='keys', tablefmt='simple'))
@@ -54,5 +54,32 @@ class AzureOpenAIClient:
         except Exception as e:
             raise RuntimeError("Error fetching GPT response") from e
 
+    async def astructured_output_generate_response(self, params: AzureOpenAIChatCompletionMessageParam) -> Dict[str, Any]:
+        """
+        Get a Structured Output Azure OpenAI response from the OpenAI API asynchronously.
+        Requires the client to be initialized with ``use_async=True``.
+
+        :param params: The parameters for the message to send to the API.
+        :return: A dictionary containing the response content and token usage.
+        """
+
+        try:
+            completion = await self.client.beta.chat.completions.parse(
+                model=self.openai_model,
+                messages=params.message_text,
+                temperature=params.temperature,
+                response_format=params.response_format,
+            )
+            return completion.choices[0].message.parsed
+        except Exception as e:
+            raise RuntimeError("Error fetching GPT response") from e
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying asynchronous client and release its connection pool.
+        Requires the client to be initialized with ``use_async=True``.
+        """
+        await self.client.close()
+
     def __repr__(self) -> str:
         return f"AzureOpenAIClient(openai_model={self.openai_model})"
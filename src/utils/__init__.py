@@ -0,0 +1,6 @@
+from src.utils.files import default_file_mode, write_atomic
+
+__all__ = [
+    "default_file_mode",
+    "write_atomic",
+]
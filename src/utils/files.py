@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from functools import lru_cache
+from typing import Union
+
+
+@lru_cache(maxsize=None)
+def default_file_mode() -> int:
+    """Mode ``open()`` creates files with under the process umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_atomic(path: str, data: Union[bytes, bytearray, memoryview]) -> None:
+    """Write ``data`` to ``path`` so readers never observe a partial file.
+
+    The data goes to a temporary file in the same directory, which then
+    replaces ``path``. The directory must already exist.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        # mkstemp creates the file owner-only; os.replace would keep that mode.
+        os.fchmod(fd, default_file_mode())
+        # Write straight to the descriptor; a buffered file object would only
+        # add a copy for a payload written in one go.
+        with memoryview(data) as view:
+            written = 0
+            while written < len(view):
+                written += os.write(fd, view[written:])
+        os.close(fd)
+        fd = -1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if fd != -1:
+            os.close(fd)
+        os.unlink(tmp_path)
+        raise
@@ -3,7 +3,6 @@ import json
 import sys
 from pathlib import Path
 from typing import Optional
-from urllib.parse import urlparse
 
 from src.services.mistral_document_ai import MistralDocumentAIClient
 from src.services.mistral_document_ai.params import (
@@ -58,8 +57,9 @@ def resolve_document_param(
     if document_ref.startswith("data:"):
         return MistralDADocumentParam(document_url=document_ref)
 
-    parsed = urlparse(document_ref)
-    if parsed.scheme in {"http", "https"}:
+    # Schemes are case-insensitive; lowering only the first eight characters
+    # avoids copying a long reference just to test its prefix.
+    if document_ref[:8].lower().startswith(("http://", "https://")):
         return MistralDADocumentParam.from_http_url(
             document_ref,
             content_type=content_type,
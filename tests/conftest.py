@@ -0,0 +1,17 @@
+import os
+import sys
+
+# The settings object is built on first import and requires every key; the
+# tests never reach the real services, so placeholders are enough.
+for _key, _value in {
+    "LANDING_AI_API_KEY": "test",
+    "AZURE_OPENAI_ENDPOINT": "https://example.openai.azure.com",
+    "AZURE_MISTRAL_ENDPOINT": "https://example.invalid/ocr",
+    "OPENAI_API_KEY": "test",
+    "AZURE_MISTRAL_API_KEY": "test",
+    "OPENAI_API_VERSION": "2024-08-01-preview",
+    "TESSERACT_CMD": "tesseract",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
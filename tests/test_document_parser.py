@@ -0,0 +1,49 @@
+import hashlib
+import os
+
+from src.ocr._mistral_document_ai import MistralDocumentAIParser
+
+
+class FakeMistralDocumentAIClient:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze_document(self, params):
+        self.calls += 1
+        return {"pages": [{"index": 0, "markdown": f"response {self.calls}"}]}
+
+
+def test_parse_response_is_cached_by_content_digest(tmp_path):
+    client = FakeMistralDocumentAIClient()
+    document = b"%PDF-1.4 first document"
+
+    first = MistralDocumentAIParser(
+        document, client=client, cache_dir=str(tmp_path)).parse()
+    replayed = MistralDocumentAIParser(
+        bytearray(document), client=client, cache_dir=str(tmp_path)).parse()
+
+    assert client.calls == 1
+    assert replayed == first
+    assert os.listdir(tmp_path) == [f"{hashlib.sha256(document).hexdigest()}.json"]
+
+
+def test_other_documents_miss_the_cache(tmp_path):
+    client = FakeMistralDocumentAIClient()
+
+    first = MistralDocumentAIParser(
+        b"%PDF-1.4 first document", client=client, cache_dir=str(tmp_path)).parse()
+    second = MistralDocumentAIParser(
+        b"%PDF-1.4 second document", client=client, cache_dir=str(tmp_path)).parse()
+
+    assert client.calls == 2
+    assert second != first
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_parse_without_cache_dir_always_calls_the_client(tmp_path):
+    client = FakeMistralDocumentAIClient()
+
+    for _ in range(2):
+        MistralDocumentAIParser(b"%PDF-1.4 first document", client=client).parse()
+
+    assert client.calls == 2
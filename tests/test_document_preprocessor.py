@@ -0,0 +1,69 @@
+import fitz
+
+from src.processor.document_preprocessor._landing_ai import LandingAIDocumentPreprocessor
+from src.processor.document_preprocessor.base import PreprocessingSettings
+
+
+def _text_pdf() -> bytes:
+    document = fitz.open()
+    page = document.new_page(width=300, height=200)
+    page.insert_text((36, 72), "Account number 12345", fontsize=14)
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def _preprocess(document: bytes, **settings) -> fitz.Document:
+    preprocessor = LandingAIDocumentPreprocessor(
+        document=document, settings=PreprocessingSettings(**settings))
+    return fitz.open(stream=preprocessor.preprocess(), filetype="pdf")
+
+
+def test_text_pages_stay_native_by_default():
+    with _preprocess(_text_pdf()) as output:
+        assert output.page_count == 1
+        page = output[0]
+        assert "Account number 12345" in page.get_text()
+        assert page.get_fonts()
+        assert not page.get_images()
+
+
+def test_force_rasterize_rasterises_text_pages():
+    with _preprocess(_text_pdf(), force_rasterize=True, raster_dpi=72) as output:
+        assert output.page_count == 1
+        page = output[0]
+        assert page.get_text().strip() == ""
+        assert not page.get_fonts()
+        assert len(page.get_images()) == 1
+
+
+
+def test_preprocessed_pdf_is_served_from_cache(tmp_path, monkeypatch):
+    document = _text_pdf()
+    settings = PreprocessingSettings(force_rasterize=True, raster_dpi=72)
+
+    first = LandingAIDocumentPreprocessor(
+        document=document, settings=settings, cache_dir=str(tmp_path)).preprocess()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def _fail(self, document_bytes):
+        raise AssertionError("cache hit expected")
+
+    monkeypatch.setattr(LandingAIDocumentPreprocessor, "_preprocess_document", _fail)
+    cached = LandingAIDocumentPreprocessor(
+        document=document, settings=settings, cache_dir=str(tmp_path)).preprocess()
+
+    assert cached == first
+
+
+def test_cache_entries_are_keyed_by_settings(tmp_path):
+    document = _text_pdf()
+
+    for force_rasterize in (False, True):
+        LandingAIDocumentPreprocessor(
+            document=document,
+            settings=PreprocessingSettings(force_rasterize=force_rasterize, raster_dpi=72),
+            cache_dir=str(tmp_path),
+        ).preprocess()
+
+    assert len(list(tmp_path.iterdir())) == 2
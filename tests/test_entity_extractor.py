@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from src.entity_extractor import _landing_ai
+from src.entity_extractor._landing_ai import LandingAIEntityExtractor
+
+
+class FakeAzureOpenAIClient:
+    """Answers each step with its own name after a per-step delay."""
+
+    def __init__(self, delays=None, failing_step=None):
+        self.delays = delays or {}
+        self.failing_step = failing_step
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = []
+        self.closed = False
+
+    async def astructured_output_generate_response(self, params):
+        step_name = params.message_text[-1]["content"].split("Text:\n", 1)[1].strip()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(step_name, 0))
+            if step_name == self.failing_step:
+                raise RuntimeError(f"LLM call failed for {step_name}")
+            self.completed.append(step_name)
+            return params.response_format(**{"Name": step_name})
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _contexts(n_steps):
+    return {
+        "steps": [
+            {"name": f"step {i}", "fields": {"Name": ""}, "context": f"step {i}"}
+            for i in range(n_steps)
+        ]
+    }
+
+
+@pytest.fixture
+def use_client(monkeypatch):
+    def _use(client):
+        monkeypatch.setattr(
+            _landing_ai, "_get_async_azure_openai_client", lambda: client)
+        return client
+    return _use
+
+
+def test_results_keep_step_order(use_client):
+    # Later steps answer first, so completion order is the reverse of step order.
+    client = use_client(FakeAzureOpenAIClient(
+        delays={f"step {i}": 0.01 * (4 - i) for i in range(5)}))
+
+    result = asyncio.run(
+        LandingAIEntityExtractor(_contexts(5)).extract_async(max_concurrency=5))
+
+    assert client.completed == [f"step {i}" for i in reversed(range(5))]
+    assert [step["step"] for step in result["steps"]] == [f"step {i}" for i in range(5)]
+    assert result["steps"][0]["fields"] == [
+        {"name": "Name", "values": [{"value": "step 0"}], "type": "string"}]
+
+
+def test_concurrency_is_bounded(use_client):
+    client = use_client(FakeAzureOpenAIClient(
+        delays={f"step {i}": 0.01 for i in range(8)}))
+
+    result = asyncio.run(
+        LandingAIEntityExtractor(_contexts(8)).extract_async(max_concurrency=3))
+
+    assert len(result["steps"]) == 8
+    assert client.max_in_flight == 3
+
+
+def test_step_error_propagates_after_other_steps_finish(use_client):
+    client = use_client(FakeAzureOpenAIClient(
+        delays={"step 2": 0.02, "step 3": 0.02}, failing_step="step 0"))
+
+    with pytest.raises(RuntimeError, match="LLM call failed for step 0"):
+        asyncio.run(LandingAIEntityExtractor(_contexts(4)).extract_async())
+
+    assert sorted(client.completed) == ["step 1", "step 2", "step 3"]
+
+
+def test_extract_closes_the_loop_client(monkeypatch):
+    client = FakeAzureOpenAIClient()
+
+    def _get_client():
+        _landing_ai._ASYNC_CLIENTS[asyncio.get_running_loop()] = client
+        return client
+
+    monkeypatch.setattr(_landing_ai, "_get_async_azure_openai_client", _get_client)
+
+    result = LandingAIEntityExtractor(_contexts(2)).extract()
+
+    assert [step["step"] for step in result["steps"]] == ["step 0", "step 1"]
+    assert client.closed
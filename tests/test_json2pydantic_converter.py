@@ -0,0 +1,30 @@
+from src.processor import StructuredJSON2PydanticConverter
+
+
+def test_identical_schemas_share_one_model():
+    schema = {"Name": "", "Opt in": "bool", "Codes": [""]}
+
+    first = StructuredJSON2PydanticConverter().convert(schema)
+    second = StructuredJSON2PydanticConverter().convert(dict(schema))
+
+    assert second is first
+
+
+def test_cached_model_round_trips_by_alias():
+    converter = StructuredJSON2PydanticConverter()
+    model = converter.convert({"Name": "", "Opt in": "bool", "Codes": [""]})
+
+    instance = model(**{"Name": "Jane", "Opt in": True, "Codes": ["A", "B"]})
+
+    assert converter.serialize(model_class=model, data=instance) == {
+        "Name": "Jane", "Opt in": True, "Codes": ["A", "B"]}
+
+
+def test_field_order_is_part_of_the_cache_key():
+    converter = StructuredJSON2PydanticConverter()
+
+    first = converter.convert({"Name": "", "Code": ""})
+    reordered = converter.convert({"Code": "", "Name": ""})
+
+    assert reordered is not first
+    assert [field.alias for field in reordered.model_fields.values()] == ["Code", "Name"]